@@ -1,6 +1,7 @@
 """
-Convertish is a module for casting/coercing to and from types. It uses
-simplegeneric to adapt.
+Convertish is a module for casting/coercing to and from types. Converters
+are looked up by schema type through converter families such as
+string_converter.
 
 The only converters currently implemented using schemaish types
 """
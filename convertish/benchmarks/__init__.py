@@ -0,0 +1,170 @@
+"""
+Benchmarks for convertish.
+
+Run every registered benchmark, optionally saving the results as a baseline or
+comparing them against one:
+
+    python -m convertish.benchmarks --save baseline.json
+    python -m convertish.benchmarks --compare baseline.json --threshold 0.2
+
+A comparison exits with status 1 if any benchmark got slower, or allocates
+more, than the threshold allows. The benchmarks themselves live in
+convertish.benchmarks.cases; bench_iso8601 is a standalone comparison of the
+ISO 8601 parsers and bench_import measures import time.
+
+For each benchmark the number of operations per second (best of several
+runs) is recorded, along with the number of garbage collector tracked objects
+each operation leaves alive while its results are kept. Python 2 has no
+allocation tracer, so that is the closest portable measure of allocation
+churn: strings and numbers are not counted, lists, dicts, tuples and
+instances are.
+"""
+__all__ = ['Benchmark', 'benchmark', 'registry', 'run', 'compare', 'main']
+
+import gc
+import json
+import re
+import sys
+import timeit
+from optparse import OptionParser
+
+
+registry = []
+
+
+class Benchmark(object):
+    """
+    A named operation, func(*args), to be timed.
+    """
+
+    def __init__(self, name, func, *args):
+        self.name = name
+        self.func = func
+        self.args = args
+
+    def __call__(self):
+        return self.func(*self.args)
+
+    def time(self, duration=0.2, repeat=3):
+        """
+        Return the best operations per second over repeat runs, each lasting
+        about duration seconds.
+        """
+        timer = timeit.Timer(self)
+        number = 1
+        while True:
+            elapsed = timer.timeit(number)
+            if elapsed >= duration / 10:
+                break
+            number *= 10
+        number = max(1, int(number * duration / elapsed))
+        best = min(timer.repeat(repeat, number))
+        return number / best if best else float('inf')
+
+    def objects(self, number=100):
+        """
+        Return the number of gc tracked objects left alive per operation
+        when the results are kept.
+        """
+        self()
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            gc.collect()
+            before = len(gc.get_objects())
+            results = [self() for n in xrange(number)]
+            after = len(gc.get_objects())
+        finally:
+            if enabled:
+                gc.enable()
+        # Discount the list holding the results.
+        return (after - before - 1) / float(number)
+
+
+def benchmark(name, func, *args):
+    """
+    Register func(*args) to be benchmarked as name.
+    """
+    registry.append(Benchmark(name, func, *args))
+
+
+def run(benchmarks=None, duration=0.2, pattern=None, out=None):
+    """
+    Run benchmarks (default: all registered), returning a results dict that
+    can be saved as JSON. Progress is written to out if given.
+    """
+    if benchmarks is None:
+        _load_cases()
+        benchmarks = registry
+    if pattern:
+        match = re.compile(pattern).search
+        benchmarks = [b for b in benchmarks if match(b.name)]
+    results = {}
+    for b in benchmarks:
+        ops = b.time(duration)
+        objects = b.objects()
+        results[b.name] = {'ops_per_sec': ops, 'objects_per_op': objects}
+        if out is not None:
+            out.write('%12.0f ops/s %8.2f objects/op  %s\n' %
+                      (ops, objects, b.name))
+    return {'python': sys.version.split()[0], 'results': results}
+
+
+def compare(results, baseline, threshold=0.1):
+    """
+    Compare results with baseline, returning a list of (name, message) for
+    every benchmark that regressed by more than threshold (a fraction).
+    Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    results, baseline = results['results'], baseline['results']
+    for name in sorted(results):
+        if name not in baseline:
+            continue
+        now, then = results[name], baseline[name]
+        if now['ops_per_sec'] < then['ops_per_sec'] * (1 - threshold):
+            regressions.append((name, '%.0f ops/s, was %.0f' % (
+                now['ops_per_sec'], then['ops_per_sec'])))
+        if now['objects_per_op'] > then['objects_per_op'] * (1 + threshold) \
+           and now['objects_per_op'] - then['objects_per_op'] >= 1:
+            regressions.append((name, '%.2f objects/op, was %.2f' % (
+                now['objects_per_op'], then['objects_per_op'])))
+    return regressions
+
+
+def _load_cases():
+    import convertish.benchmarks.cases
+
+
+def main(argv=sys.argv[1:], out=sys.stdout):
+    parser = OptionParser(usage='python -m convertish.benchmarks [options]')
+    parser.add_option('--save', metavar='FILE',
+                      help='save the results as a JSON baseline')
+    parser.add_option('--compare', metavar='FILE',
+                      help='compare the results with a saved baseline')
+    parser.add_option('--threshold', type='float', default=0.1,
+                      help='allowed regression as a fraction [%default]')
+    parser.add_option('--duration', type='float', default=0.2,
+                      help='seconds per timing run [%default]')
+    parser.add_option('--filter', metavar='REGEX',
+                      help='only run benchmarks whose name matches')
+    options, args = parser.parse_args(argv)
+    results = run(duration=options.duration, pattern=options.filter, out=out)
+    if options.save:
+        f = open(options.save, 'w')
+        try:
+            json.dump(results, f, indent=2, sort_keys=True)
+        finally:
+            f.close()
+    if options.compare:
+        f = open(options.compare)
+        try:
+            baseline = json.load(f)
+        finally:
+            f.close()
+        regressions = compare(results, baseline, options.threshold)
+        for name, message in regressions:
+            out.write('REGRESSION %s: %s\n' % (name, message))
+        if regressions:
+            return 1
+    return 0
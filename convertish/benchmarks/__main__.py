@@ -0,0 +1,5 @@
+import sys
+
+from convertish.benchmarks import main
+
+sys.exit(main())
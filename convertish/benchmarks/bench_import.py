@@ -0,0 +1,73 @@
+"""
+Measure how long importing convertish takes in a fresh interpreter.
+
+    python -m convertish.benchmarks.bench_import [--runs N] [--max MS] [module]
+
+The best of several runs is reported for each module, along with the modules
+that are meant to load lazily but were imported anyway. The status is 1 if
+any of them were, or if the import took longer than --max milliseconds.
+
+Python 2 has no -X importtime, so only the total is measured.
+"""
+import ast
+import subprocess
+import sys
+from optparse import OptionParser
+
+
+MODULES = ['convertish.convert', 'convertish.jsoncodec']
+
+# Only needed by some converters, see convertish.convert.
+LAZY = ['csv', 'decimal', 'tempfile', 'threading', 'numpy']
+
+_PROBE = '''
+import sys
+from timeit import default_timer as timer
+start = timer()
+import %s
+elapsed = timer() - start
+print('%%r %%r' %% (elapsed, sorted(sys.modules)))
+'''
+
+
+def measure(module, runs=5):
+    """
+    Return the best time in seconds to import module in a fresh interpreter
+    and the modules loaded by then.
+    """
+    best, loaded = None, None
+    for n in xrange(runs):
+        output = subprocess.Popen([sys.executable, '-c', _PROBE % module],
+                                  stdout=subprocess.PIPE).communicate()[0]
+        elapsed, modules = output.split(' ', 1)
+        elapsed = float(elapsed)
+        if best is None or elapsed < best:
+            best, loaded = elapsed, ast.literal_eval(modules)
+    return best, loaded
+
+
+def main(argv=sys.argv[1:], out=sys.stdout):
+    parser = OptionParser(usage='python -m convertish.benchmarks.bench_import '
+                          '[options] [module ...]')
+    parser.add_option('--runs', type='int', default=5,
+                      help='interpreters to start per module [%default]')
+    parser.add_option('--max', type='float', metavar='MS',
+                      help='fail if an import takes longer than this')
+    options, modules = parser.parse_args(argv)
+    status = 0
+    for module in modules or MODULES:
+        elapsed, loaded = measure(module, options.runs)
+        eager = [name for name in LAZY if name in loaded]
+        out.write('%8.2f ms  %3d modules  %s\n' % (elapsed * 1000, len(loaded),
+                                                  module))
+        if eager:
+            out.write('    imported eagerly: %s\n' % ', '.join(eager))
+            status = 1
+        if options.max is not None and elapsed * 1000 > options.max:
+            out.write('    slower than %.2f ms\n' % options.max)
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
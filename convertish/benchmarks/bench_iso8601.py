@@ -0,0 +1,95 @@
+"""
+Compare the ISO 8601 parsers with the split based helpers they replaced.
+
+    python -m convertish.benchmarks.bench_iso8601 [count]
+"""
+import sys
+import time as _time
+from datetime import date, datetime, time
+
+from convertish import iso8601
+from convertish.util import SimpleTZInfo
+
+
+def legacy_parse_date(value):
+    y, m, d = [int(p) for p in value.split('-')]
+    return date(y, m, d)
+
+
+def legacy_parse_time(value):
+    if '+' in value:
+        value, tz = value.split('+')
+        tzdir = 1
+    elif '-' in value:
+        value, tz = value.split('-')
+        tzdir = -1
+    else:
+        tz = None
+    if tz:
+        hours, minutes = tz.split(':')
+        tz = SimpleTZInfo(tzdir*((int(hours)*60) + int(minutes)))
+    if '.' in value:
+        value, ms = value.split('.')
+    else:
+        ms = 0
+    parts = value.split(':')
+    if len(parts) == 2:
+        h, m = parts
+        s = 0
+    else:
+        h, m, s = parts
+    h, m, s, ms = int(h), int(m), int(s), int(ms)
+    return time(h, m, s, ms, tz)
+
+
+def legacy_parse_datetime(value):
+    d, t = value.split('T')
+    d = legacy_parse_date(d)
+    t = legacy_parse_time(t)
+    return datetime(d.year, d.month, d.day, t.hour, t.minute, t.second,
+                    t.microsecond, t.tzinfo)
+
+
+def timestamps(count):
+    tz = SimpleTZInfo(90)
+    start = datetime(2009, 1, 5, 0, 0, 0, 0, tz).toordinal()
+    values = []
+    for n in xrange(count):
+        d = date.fromordinal(start + n % 3650)
+        values.append(datetime(d.year, d.month, d.day, n % 24, n % 60,
+                               n % 59, (n * 7919) % 1000000, tz).isoformat())
+    return values
+
+
+def run(parse, values):
+    start = _time.time()
+    for value in values:
+        parse(value)
+    return _time.time() - start
+
+
+def main(argv=sys.argv[1:]):
+    count = int(argv[0]) if argv else 1000000
+    values = timestamps(count)
+    print 'Parsing %d timestamps' % count
+    for name, legacy, current in [
+            ('date', legacy_parse_date, iso8601.parse_date),
+            ('time', legacy_parse_time, iso8601.parse_time),
+            ('datetime', legacy_parse_datetime, iso8601.parse_datetime)]:
+        if name == 'date':
+            data = [v[:10] for v in values]
+        elif name == 'time':
+            data = [v[11:] for v in values]
+        else:
+            data = values
+        before = run(legacy, data)
+        after = run(current, data)
+        print '%-10s legacy %8.0f/s  iso8601 %8.0f/s  speedup %.2fx' % (
+            name, count / before, count / after, before / after)
+    start = _time.time()
+    iso8601.parse_many(iso8601.parse_datetime, values)
+    print '%-10s parse_many %8.0f/s' % ('datetime', count / (_time.time() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+The benchmarks run by python -m convertish.benchmarks.
+
+Every converter in convertish.convert is benchmarked in both directions,
+along with nested Sequence/Tuple CSV and the cost of dispatch itself.
+"""
+from cStringIO import StringIO
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import schemaish
+import schemaish.type
+
+from convertish.benchmarks import benchmark
+from convertish.convert import string_converter, json_converter, \
+        datetuple_converter, boolean_converter, file_converter, \
+        binary_converter
+from convertish.util import SimpleTZInfo
+
+
+TZ = SimpleTZInfo(90)
+
+
+def converters(family, schema, value, converter_options={}):
+    """
+    Register from_type and to_type benchmarks for one family and schema,
+    value being the typed value.
+    """
+    converter = family(schema)
+    name = '%s[%s]' % (family.__name__,
+                       repr(schema).replace('schemaish.', ''))
+    if converter_options:
+        name += repr(converter_options)
+    converted = converter.from_type(value, converter_options)
+    benchmark(name + '.from_type', converter.from_type, value,
+              converter_options)
+    benchmark(name + '.to_type', converter.to_type, converted,
+              converter_options)
+
+
+for family, cases in [
+        (string_converter, [
+            (schemaish.String(), u'hello'),
+            (schemaish.Integer(), 1234567),
+            (schemaish.Float(), 1234.5678),
+            (schemaish.Decimal(), Decimal('1234.56')),
+            (schemaish.Boolean(), True),
+            (schemaish.Date(), date(2009, 5, 1)),
+            (schemaish.Time(), time(12, 30, 15, 250000, TZ)),
+            (schemaish.DateTime(), datetime(2009, 5, 1, 12, 30, 15, 250000, TZ)),
+        ]),
+        (json_converter, [
+            (schemaish.String(), u'hello'),
+            (schemaish.Integer(), 1234567),
+            (schemaish.Float(), 1234.5678),
+            (schemaish.Decimal(), Decimal('1234.56')),
+            (schemaish.Boolean(), True),
+            (schemaish.Date(), date(2009, 5, 1)),
+            (schemaish.Time(), time(12, 30, 15, 250000)),
+            (schemaish.Tuple((schemaish.Integer(), schemaish.String())),
+             (1, u'a')),
+            (schemaish.Sequence(schemaish.Integer()), range(100)),
+        ]),
+        (binary_converter, [
+            (schemaish.String(), u'hello'),
+            (schemaish.Integer(), 1234567),
+            (schemaish.Float(), 1234.5678),
+            (schemaish.Decimal(), Decimal('1234.56')),
+            (schemaish.Boolean(), True),
+            (schemaish.Date(), date(2009, 5, 1)),
+            (schemaish.Time(), time(12, 30, 15, 250000, TZ)),
+            (schemaish.DateTime(), datetime(2009, 5, 1, 12, 30, 15, 250000, TZ)),
+            (schemaish.Sequence(schemaish.Integer()), range(1000)),
+            (schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                                 schemaish.String(),
+                                                 schemaish.Boolean()))),
+             [(n, u'row %d' % n, n % 2 == 0) for n in range(100)]),
+        ]),
+        (datetuple_converter, [(schemaish.Date(), date(2009, 5, 1))]),
+        (boolean_converter, [(schemaish.Boolean(), True)]),
+        (file_converter, [(schemaish.File(),
+                           schemaish.type.File(None, None, None))]),
+    ]:
+    for schema, value in cases:
+        converters(family, schema, value)
+
+converters(string_converter, schemaish.Decimal(), Decimal('1234.567'),
+           {'quantize': -2})
+
+
+# CSV sequences and tuples.
+
+converters(string_converter, schemaish.Sequence(schemaish.Integer()),
+           range(1000))
+converters(string_converter, schemaish.Sequence(schemaish.Date()),
+           [date(2009, 5, 1)] * 1000)
+converters(string_converter, schemaish.Tuple((schemaish.Integer(),
+                                              schemaish.String(),
+                                              schemaish.Date())),
+           (1, u'a,b', date(2009, 5, 1)))
+converters(string_converter,
+           schemaish.Sequence(schemaish.Sequence(schemaish.Float())),
+           [[float(n) for n in range(10)]] * 100)
+converters(string_converter,
+           schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                               schemaish.String(),
+                                               schemaish.Boolean()))),
+           [(n, u'row %d' % n, n % 2 == 0) for n in range(100)])
+
+
+# Bulk validation, all valid and all invalid.
+
+for schema, valid, invalid in [
+        (schemaish.Integer(), '1234', '12x4'),
+        (schemaish.Date(), '2009-05-01', '2009-05-xx')]:
+    _converter = string_converter(schema)
+    _name = 'string_converter[%s].to_type_batch' % (
+        repr(schema).replace('schemaish.', ''),)
+    benchmark(_name + '[valid]', _converter.to_type_batch, [valid] * 1000)
+    benchmark(_name + '[invalid]', _converter.to_type_batch, [invalid] * 1000)
+
+
+# Files need a fresh file-like object for every conversion.
+
+def file_from_type(converter, content):
+    return converter.from_type(schemaish.type.File(StringIO(content), None,
+                                                   None))
+
+_file_converter = string_converter(schemaish.File())
+benchmark('string_converter[File()].from_type', file_from_type,
+          _file_converter, 'x' * 10000)
+benchmark('string_converter[File()].to_type',
+          _file_converter.to_type, u'x' * 10000)
+
+
+# Dispatch: a schema seen before (cached) and a brand new one every time.
+
+_integer = schemaish.Integer()
+_sequence = schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                                schemaish.String())))
+benchmark('dispatch.string_converter[Integer].cached', string_converter,
+          _integer)
+benchmark('dispatch.string_converter[Sequence].cached', string_converter,
+          _sequence)
+
+def dispatch_new(family, cls):
+    return family(cls())
+
+benchmark('dispatch.string_converter[Integer].new', dispatch_new,
+          string_converter, schemaish.Integer)
+benchmark('dispatch.json_converter[Date].new', dispatch_new,
+          json_converter, schemaish.Date)
+
+
+# Fixed-width records: a thousand telemetry rows packed into one buffer.
+
+from convertish.records import RecordConverter
+
+_telemetry = schemaish.Tuple((schemaish.Integer(), schemaish.Float(),
+                              schemaish.Boolean(), schemaish.DateTime()))
+_rows = [(n, n / 4.0, n % 2 == 0, datetime(2009, 5, 1, 12, 0, n % 60))
+         for n in range(1000)]
+_records = RecordConverter(_telemetry)
+_buf = _records.pack_many(_rows)
+
+def scan_column(records, buf, n):
+    for value in records.iter_column(buf, n):
+        pass
+
+benchmark('records[telemetry].pack_many', _records.pack_many, _rows)
+benchmark('records[telemetry].unpack_many', _records.unpack_many, _buf)
+benchmark('records[telemetry].iter_column[Float]', scan_column, _records,
+          memoryview(_buf), 1)
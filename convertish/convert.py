@@ -1,29 +1,51 @@
 __all__ = ['string_converter', 'datetuple_converter', 'boolean_converter',
-           'file_converter','json_converter']
-
-import csv
+           'file_converter','json_converter', 'binary_converter', 'register',
+           'converter_cache_info']
+
+import array
+import codecs
+import imp
+import re
+import struct
+import sys
 from cStringIO import StringIO
 from datetime import date, datetime, time
-from simplegeneric import generic
 import schemaish
 
+from convertish import iso8601
+from convertish.util import LazyModule, SimpleTZInfo
+
+# Only some converters need these, so they are imported on first use.
+csv = LazyModule('csv')
+decimal = LazyModule('decimal')
+tempfile = LazyModule('tempfile')
+threading = LazyModule('threading')
+numpy = LazyModule('numpy')
+
 try:
-    import decimal
+    imp.find_module('decimal')
     haveDecimal = True
 except ImportError:
     haveDecimal = False
 
-from convertish.util import SimpleTZInfo
+try:
+    imp.find_module('numpy')
+    haveNumpy = True
+except ImportError:
+    haveNumpy = False
 
 
 class ConvertError(Exception):
     """
     Exception to indicate failure in converting values.
+
+    Batch conversions set index to the position of the failing value.
     """
 
-    def __init__(self, message):
+    def __init__(self, message, index=None):
         Exception.__init__(self, message)
         self.message = message
+        self.index = index
 
     def __str__(self):
         return self.message
@@ -35,11 +57,64 @@ class ConvertError(Exception):
     message = property(_get_message, _set_message)
 
 
+class BatchResult(object):
+    """
+    The outcome of converting a batch of values without raising ConvertError:
+    values is the list of converted values, with None for those that failed,
+    and errors a list of (index, message) pairs in index order.
+    """
+
+    __slots__ = ('values', 'errors')
+
+    def __init__(self, values, errors):
+        self.values = values
+        self.errors = errors
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def check(self):
+        """
+        Return values, or raise a ConvertError for the first error.
+        """
+        if self.errors:
+            index, message = self.errors[0]
+            raise ConvertError(message, index=index)
+        return self.values
+
+    def __repr__(self):
+        return '<BatchResult %d values, %d errors>' % (len(self.values),
+                                                       len(self.errors))
+
+
 class Converter(object):
+
+    # Subclasses without __slots__ of their own still get an instance dict.
+    __slots__ = ('schema_type', 'converter_options')
+
+    # Whether to_type's results are immutable, so convertish.memo can hand
+    # the same result out again.
+    memoizable = False
     
     def __init__(self, schema_type, **k):
         self.schema_type = schema_type
         self.converter_options = k.pop('converter_options', {})
+
+    def __getstate__(self):
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            if isinstance(slots, basestring):
+                slots = (slots,)
+            for name in slots:
+                if name != '__dict__' and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
         
     def from_type(self, value, converter_options={}):
         """
@@ -53,8 +128,107 @@ class Converter(object):
         """
         raise NotImplementedError()
 
+    def from_type_many(self, values, converter_options={}):
+        """
+        from_type every item of values, returning a list
+        """
+        return _convert_many(self.from_type, values, converter_options)
+
+    def to_type_many(self, values, converter_options={}):
+        """
+        to_type every item of values, returning a list
+        """
+        return _convert_many(self.to_type, values, converter_options)
+
+    def to_type_batch(self, values, converter_options={}):
+        """
+        to_type every item of values, collecting errors rather than raising,
+        returning a BatchResult
+        """
+        to_type = self.to_type
+        out = []
+        append = out.append
+        errors = []
+        for n, value in enumerate(values):
+            try:
+                append(to_type(value, converter_options))
+            except ConvertError, e:
+                append(None)
+                errors.append((n, e.message))
+        return BatchResult(out, errors)
+
 
-class NullConverter(Converter):
+def _convert_many(convert, values, converter_options):
+    out = []
+    append = out.append
+    for n, value in enumerate(values):
+        try:
+            append(convert(value, converter_options))
+        except ConvertError, e:
+            raise ConvertError(e.message, index=n)
+    return out
+
+
+class LeafConverter(Converter):
+    """
+    Base for stateless converters of simple values, which never look at
+    their schema type. Creating one returns an instance shared by every
+    schema of the same class, e.g. all schemaish.Integer()s share one
+    IntegerToStringConverter, so dispatching a new schema allocates nothing.
+
+    The shared instance's schema_type is None (unlike any other converter's)
+    and its schema_class is the schema class. Converters that need the
+    schema instance should derive from Converter instead.
+
+    Only classes defining __slots__ of their own, and so no instance state,
+    and not overriding __init__, which would run again on the shared
+    instance every time, are shared. Any other subclass, or a converter
+    created with extra arguments, is an ordinary instance of its own.
+    """
+
+    __slots__ = ('schema_class',)
+
+    _shared = {}
+
+    def __new__(cls, schema_type=None, *a, **k):
+        if a or k or '__slots__' not in cls.__dict__ or \
+           cls.__init__ != LeafConverter.__init__:
+            self = Converter.__new__(cls)
+            Converter.__init__(self, schema_type, **k)
+            self.schema_class = type(schema_type)
+            return self
+        return _leaf_converter(cls, type(schema_type))
+
+    def __init__(self, schema_type=None, *a, **k):
+        pass
+
+    def __reduce_ex__(self, protocol):
+        if LeafConverter._shared.get((type(self), self.schema_class)) is self:
+            return (_leaf_converter, (type(self), self.schema_class))
+        return (_new_converter, (type(self),), self.__getstate__())
+
+
+def _leaf_converter(cls, schema_class):
+    key = cls, schema_class
+    try:
+        return LeafConverter._shared[key]
+    except KeyError:
+        pass
+    self = Converter.__new__(cls)
+    self.schema_type = None
+    self.schema_class = schema_class
+    self.converter_options = {}
+    return LeafConverter._shared.setdefault(key, self)
+
+
+def _new_converter(cls):
+    return Converter.__new__(cls)
+
+
+class NullConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
 
     def from_type(self, value, converter_options={}):
         return value
@@ -62,11 +236,26 @@ class NullConverter(Converter):
     def to_type(self, value, converter_options={}):
         return value
 
+    def from_type_many(self, values, converter_options={}):
+        return list(values)
+
+    def to_type_many(self, values, converter_options={}):
+        return list(values)
 
-class NumberToStringConverter(Converter):
+    def to_type_batch(self, values, converter_options={}):
+        return BatchResult(list(values), [])
 
+
+class NumberToStringConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
     cast = None
     type_string = 'number'
+    # Optional match function for values cast accepts, letting to_type_batch
+    # reject bad values without the cost of an exception. Values made up of
+    # digits alone are assumed to match.
+    syntax = None
     
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -85,23 +274,240 @@ class NumberToStringConverter(Converter):
         except (ValueError, ArithmeticError):
             raise ConvertError("Not a valid %s"%self.type_string)
         return value
+
+    def from_type_many(self, values, converter_options={}):
+        return [None if value is None else str(value) for value in values]
+
+    def to_type_many(self, values, converter_options={}):
+        cast = self.cast
+        out = []
+        append = out.append
+        for n, value in enumerate(values):
+            if value is None:
+                append(None)
+                continue
+            try:
+                append(cast(value.strip()))
+            except (ValueError, ArithmeticError):
+                raise ConvertError("Not a valid %s"%self.type_string, index=n)
+        return out
+
+    def to_type_batch(self, values, converter_options={}):
+        cast = self.cast
+        syntax = self.syntax
+        message = "Not a valid %s"%self.type_string
+        out = []
+        append = out.append
+        errors = []
+        for n, value in enumerate(values):
+            if value is None:
+                append(None)
+                continue
+            value = value.strip()
+            if syntax is not None and not value.isdigit() and \
+               syntax(value) is None:
+                append(None)
+                errors.append((n, message))
+                continue
+            try:
+                append(cast(value))
+            except (ValueError, ArithmeticError):
+                append(None)
+                errors.append((n, message))
+        return BatchResult(out, errors)
         
         
 class IntegerToStringConverter(NumberToStringConverter):
+    __slots__ = ()
+
     cast = int
     type_string = 'integer'
+    syntax = re.compile(r'[-+]?\d+$', re.UNICODE).match
 
 
 class FloatToStringConverter(NumberToStringConverter):
+    __slots__ = ()
+
     cast = float
 
 
 if haveDecimal:
-    class DecimalToStringConverter(NumberToStringConverter):
-        cast = decimal.Decimal
 
+    class DecimalConverter(LeafConverter):
+        """
+        Base for Decimal converters.
+
+        The precision (significant digits, None for exact) and quantize
+        (exponent to round values to, e.g. -2, '0.01' or Decimal('0.01'))
+        class attributes can be overridden with converter_options of the same
+        name.
+        """
+
+        __slots__ = ()
 
-class FileToStringConverter(Converter):
+        memoizable = True
+        precision = None
+        quantize = None
+
+        def _engine(self, converter_options):
+            if not converter_options:
+                return _decimal_engine(self.precision, self.quantize)
+            return _decimal_engine(
+                converter_options.get('precision', self.precision),
+                converter_options.get('quantize', self.quantize))
+
+
+    class DecimalToStringConverter(NumberToStringConverter, DecimalConverter):
+        __slots__ = ()
+
+        @staticmethod
+        def cast(value):
+            return decimal.Decimal(value)
+
+        def from_type(self, value, converter_options={}):
+            if value is None:
+                return None
+            return self._engine(converter_options).format(value)
+
+        def to_type(self, value, converter_options={}):
+            if value is None:
+                return None
+            return self._engine(converter_options).parse(value)
+
+        def from_type_many(self, values, converter_options={}):
+            format = self._engine(converter_options).format
+            return [None if value is None else format(value)
+                    for value in values]
+
+        def to_type_many(self, values, converter_options={}):
+            parse = self._engine(converter_options).parse
+            out = []
+            append = out.append
+            for n, value in enumerate(values):
+                if value is None:
+                    append(None)
+                    continue
+                try:
+                    append(parse(value))
+                except ConvertError, e:
+                    raise ConvertError(e.message, index=n)
+            return out
+
+        def to_type_batch(self, values, converter_options={}):
+            parse = self._engine(converter_options).parse
+            out = []
+            append = out.append
+            errors = []
+            for n, value in enumerate(values):
+                if value is None:
+                    append(None)
+                    continue
+                try:
+                    append(parse(value))
+                except ConvertError, e:
+                    append(None)
+                    errors.append((n, e.message))
+            return BatchResult(out, errors)
+
+
+    class _DecimalEngine(object):
+        """
+        Parses and formats Decimals for one precision and quantization
+        exponent, using a shared context and memoizing results. Decimals are
+        immutable so memoized values can be handed out freely. The memos are
+        simply emptied when they reach memo_size.
+
+        Formatting rounds to the precision and quantizes just as parsing
+        does. Hashing a Decimal is slower than formatting it, so formatting
+        is only memoized (by as_tuple()) when it involves either.
+        """
+
+        memo_size = 4096
+
+        def __init__(self, precision, exponent):
+            self.precision = precision
+            self.exponent = exponent
+            if precision is None:
+                self.context = decimal.Context()
+                self.create = decimal.Decimal
+            else:
+                self.context = decimal.Context(prec=precision)
+                self.create = self.context.create_decimal
+            if exponent is not None:
+                self.quantum = decimal.Decimal((0, (1,), exponent))
+            self._parsed = {}
+            self._formatted = {}
+
+        def parse(self, value):
+            value = value.strip()
+            try:
+                return self._parsed[value]
+            except KeyError:
+                pass
+            try:
+                result = self.create(value)
+                if self.exponent is not None:
+                    result = result.quantize(self.quantum, context=self.context)
+            except (ValueError, ArithmeticError):
+                raise ConvertError("Not a valid number")
+            if len(self._parsed) >= self.memo_size:
+                self._parsed.clear()
+            self._parsed[value] = result
+            return result
+
+        def quantized(self, value):
+            if self.precision is not None:
+                value = self.context.plus(value)
+            if self.exponent is None:
+                return value
+            return value.quantize(self.quantum, context=self.context)
+
+        def format(self, value):
+            if self.exponent is None and self.precision is None:
+                return str(value)
+            key = value.as_tuple()
+            try:
+                return self._formatted[key]
+            except KeyError:
+                pass
+            try:
+                result = str(self.quantized(value))
+            except ArithmeticError:
+                raise ConvertError("Not a valid number")
+            if len(self._formatted) >= self.memo_size:
+                self._formatted.clear()
+            self._formatted[key] = result
+            return result
+
+        def scaled(self, value):
+            """
+            Return value as an integer count of units of the exponent.
+            """
+            return int(self.quantized(value).scaleb(-self.exponent))
+
+        def unscaled(self, value):
+            try:
+                return decimal.Decimal(value).scaleb(self.exponent)
+            except (TypeError, ValueError, ArithmeticError):
+                raise ConvertError("Not a valid number")
+
+
+    _decimal_engines = {}
+
+
+    def _decimal_engine(precision, quantize):
+        if quantize is None or isinstance(quantize, (int, long)):
+            exponent = quantize
+        else:
+            exponent = decimal.Decimal(quantize).as_tuple()[2]
+        try:
+            return _decimal_engines[precision, exponent]
+        except KeyError:
+            engine = _DecimalEngine(precision, exponent)
+            return _decimal_engines.setdefault((precision, exponent), engine)
+
+
+class FileToStringConverter(LeafConverter):
     """
     Convert between a text File and a string.
 
@@ -110,25 +516,88 @@ class FileToStringConverter(Converter):
 
     Converting from a string to a File instance returns a new File with a
     default name, content.txt, of type text/plain.
+
+    Large content can be handled without holding several copies in memory.
+    Pass converter_options={'chunked': True} to from_type to get an iterator
+    of text chunks, decoded incrementally chunk_size bytes at a time. to_type
+    spools strings longer than spool_threshold characters to a temporary
+    file, encoding them chunk by chunk. Both can be overridden with
+    converter_options of the same name.
     """
+
+    __slots__ = ()
+
+    chunk_size = 64 * 1024
+    spool_threshold = 1024 * 1024
     
     def from_type(self, value, converter_options={}):
         if value is None:
             return None
+        if converter_options.get('chunked'):
+            return self.iter_from_type(value, converter_options)
         if not value.file:
             raise ValueError('Cannot convert to string without a file-like '
                              'object to read from')
         return value.file.read().decode('utf-8')
+
+    def iter_from_type(self, value, converter_options={}):
+        """
+        Return an iterator of the file's content as text chunks.
+        """
+        if value is None:
+            return iter([])
+        if not value.file:
+            raise ValueError('Cannot convert to string without a file-like '
+                             'object to read from')
+        chunk_size = converter_options.get('chunk_size', self.chunk_size)
+        return _iter_decoded(value.file, chunk_size)
         
     def to_type(self, value, converter_options={}):
         if value is None:
             return None
         value = value.strip()
-        return schemaish.type.File(StringIO(value.encode('utf-8')),
-                                   'content.txt', 'text/plain')
+        threshold = converter_options.get('spool_threshold',
+                                          self.spool_threshold)
+        if len(value) <= threshold:
+            f = StringIO(value.encode('utf-8'))
+        else:
+            f = tempfile.TemporaryFile()
+            chunk_size = converter_options.get('chunk_size', self.chunk_size)
+            for chunk in _iter_encoded(value, chunk_size):
+                f.write(chunk)
+            f.seek(0)
+        return schemaish.type.File(f, 'content.txt', 'text/plain')
+
+
+def _iter_decoded(f, chunk_size, encoding='utf-8'):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    while True:
+        data = f.read(chunk_size)
+        if not data:
+            break
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode('', True)
+    if text:
+        yield text
+
+
+def _iter_encoded(value, chunk_size, encoding='utf-8'):
+    start, end = 0, len(value)
+    while start < end:
+        stop = start + chunk_size
+        # Don't split a surrogate pair on narrow Python builds.
+        if stop < end and u'\ud800' <= value[stop-1] <= u'\udbff':
+            stop += 1
+        yield value[start:stop].encode(encoding)
+        start = stop
 
     
-class BooleanToStringConverter(Converter):
+class BooleanToStringConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
     
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -145,8 +614,49 @@ class BooleanToStringConverter(Converter):
             raise ConvertError('%r should be either True or False'%value)
         return value == 'True'
 
+    def from_type_many(self, values, converter_options={}):
+        return [None if value is None else (value and 'True' or 'False')
+                for value in values]
+
+    def to_type_many(self, values, converter_options={}):
+        lookup = _BOOLEANS.get
+        out = []
+        append = out.append
+        for n, value in enumerate(values):
+            if value is None:
+                append(None)
+                continue
+            result = lookup(value.strip())
+            if result is None:
+                raise ConvertError('%r should be either True or False' %
+                                   value.strip(), index=n)
+            append(result)
+        return out
+
+    def to_type_batch(self, values, converter_options={}):
+        lookup = _BOOLEANS.get
+        out = []
+        append = out.append
+        errors = []
+        for n, value in enumerate(values):
+            if value is None:
+                append(None)
+                continue
+            result = lookup(value.strip())
+            if result is None:
+                errors.append((n, '%r should be either True or False' %
+                               value.strip()))
+            append(result)
+        return BatchResult(out, errors)
+
+
+_BOOLEANS = {'True': True, 'False': False}
+
     
-class DateToStringConverter(Converter):
+class DateToStringConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
     
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -159,8 +669,20 @@ class DateToStringConverter(Converter):
         value = value.strip()
         return _parse_date(value)
 
+    def from_type_many(self, values, converter_options={}):
+        return _isoformat_many(values)
+
+    def to_type_many(self, values, converter_options={}):
+        return _parse_many(iso8601.parse_date, 'date', values)
+
+    def to_type_batch(self, values, converter_options={}):
+        return _parse_batch(iso8601.parse_date, 'date', values)
+
         
-class TimeToStringConverter(Converter):
+class TimeToStringConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
     
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -172,77 +694,102 @@ class TimeToStringConverter(Converter):
             return None
         value = value.strip()
         return _parse_time(value)
+
+    def from_type_many(self, values, converter_options={}):
+        return _isoformat_many(values)
+
+    def to_type_many(self, values, converter_options={}):
+        return _parse_many(iso8601.parse_time, 'time', values)
+
+    def to_type_batch(self, values, converter_options={}):
+        return _parse_batch(iso8601.parse_time, 'time', values)
         
 
-class DateTimeToStringConverter(Converter):
+class DateTimeToStringConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
 
     def from_type(self, value, converter_options={}):
+        if value is None:
+            return None
         return value.isoformat()
 
     def to_type(self, value, converter_options={}):
-        d, t = value.split('T')
-        d = _parse_date(d)
-        t = _parse_time(t)
-        return datetime(d.year, d.month, d.day, t.hour, t.minute, t.second,
-                        t.microsecond, t.tzinfo)
+        if value is None:
+            return None
+        value = value.strip()
+        return _parse_datetime(value)
+
+    def from_type_many(self, values, converter_options={}):
+        return _isoformat_many(values)
+
+    def to_type_many(self, values, converter_options={}):
+        return _parse_many(iso8601.parse_datetime, 'datetime', values)
+
+    def to_type_batch(self, values, converter_options={}):
+        return _parse_batch(iso8601.parse_datetime, 'datetime', values)
+
+
+def _isoformat_many(values):
+    return [None if value is None else value.isoformat() for value in values]
+
+
+def _parse_many(parse, kind, values):
+    try:
+        return iso8601.parse_many(parse, (None if value is None else
+                                          value.strip() for value in values))
+    except ValueError, e:
+        raise ConvertError(_invalid(kind, e), index=e.index)
+
+
+def _parse_batch(parse, kind, values):
+    out = []
+    append = out.append
+    errors = []
+    for n, value in enumerate(values):
+        if value is None:
+            append(None)
+            continue
+        try:
+            append(parse(value.strip()))
+        except ValueError, e:
+            append(None)
+            errors.append((n, _invalid(kind, e)))
+    return BatchResult(out, errors)
 
     
 def _parse_date(value):
     try:
-        y, m, d = [int(p) for p in value.split('-')]
-    except ValueError:
-        raise ConvertError('Invalid date')
-    try:
-        value = date(y, m, d)
+        return iso8601.parse_date(value)
     except ValueError, e:
-        raise ConvertError('Invalid date: '+str(e))
-    return value
+        raise ConvertError(_invalid('date', e))
 
 
 def _parse_time(value):
-    
-    # Parse the timezone offset
-    if '+' in value:
-        value, tz = value.split('+')
-        tzdir = 1
-    elif '-' in value:
-        value, tz = value.split('-')
-        tzdir = -1
-    else:
-        tz = None
-    if tz:
-        hours, minutes = tz.split(':')
-        tz = SimpleTZInfo(tzdir*((int(hours)*60) + int(minutes)))
-
-    # Parse milliseconds.
-    if '.' in value:
-        value, ms = value.split('.')
-    else:
-        ms = 0
-        
-    # Parse hours, minutes and seconds.
     try:
-        parts = value.split(':')  
-        if len(parts)<2 or len(parts)>3:
-            raise ValueError()
-        if len(parts) == 2:
-            h, m = parts
-            s = 0
-        else:
-            h, m, s = parts
-        h, m, s, ms = int(h), int(m), int(s), int(ms)
-    except:
-        raise ConvertError('Invalid time')
-    
+        return iso8601.parse_time(value)
+    except ValueError, e:
+        raise ConvertError(_invalid('time', e))
+
+
+def _parse_datetime(value):
     try:
-        value = time(h, m, s, ms, tz)
+        return iso8601.parse_datetime(value)
     except ValueError, e:
-        raise ConvertError('Invalid time: '+str(e))
-        
-    return value
+        raise ConvertError(_invalid('datetime', e))
+
 
+def _invalid(kind, e):
+    if str(e):
+        return 'Invalid %s: %s' % (kind, e)
+    return 'Invalid %s' % kind
 
-class DateToDateTupleConverter(Converter):
+
+class DateToDateTupleConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
     
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -263,12 +810,20 @@ class DateToDateTupleConverter(Converter):
         return value
 
 
+_dialects = {}
+
+
 def getDialect(delimiter=','):
+    try:
+        return _dialects[delimiter]
+    except KeyError:
+        pass
     class Dialect(csv.excel):
         def __init__(self, *a, **k):
             self.delimiter = k.pop('delimiter',',')
             csv.excel.__init__(self,*a, **k)
-    return Dialect(delimiter=delimiter)
+    dialect = _dialects[delimiter] = Dialect(delimiter=delimiter)
+    return dialect
 
 
 def convert_csvrow_to_list(row, delimiter=','):
@@ -287,6 +842,51 @@ def convert_list_to_csvrow(l, delimiter=','):
     return sf.read().strip().decode('utf-8')
 
 
+class _RowParser(object):
+    """
+    Parse single CSV rows, reusing one csv.reader rather than creating it
+    and a buffer for every row like convert_csvrow_to_list. An empty string
+    is an empty row.
+    """
+
+    def __init__(self, delimiter=','):
+        self.lines = iter(())
+        self.reader = csv.reader(self, dialect=getDialect(delimiter=delimiter))
+
+    def __iter__(self):
+        return self
+
+    def next(self):
+        return self.lines.next()
+
+    def parse(self, row):
+        self.lines = iter(row.encode('utf-8').splitlines(True))
+        try:
+            cells = self.reader.next()
+        except StopIteration:
+            return []
+        return [cell.decode('utf-8') for cell in cells]
+
+
+class _RowFormatter(object):
+    """
+    Format rows as CSV strings, reusing one buffer and csv.writer rather than
+    creating them for every row like convert_list_to_csvrow.
+    """
+
+    def __init__(self, delimiter=','):
+        self.buffer = StringIO()
+        self.writer = csv.writer(self.buffer,
+                                 dialect=getDialect(delimiter=delimiter))
+
+    def format(self, row):
+        buffer = self.buffer
+        buffer.seek(0)
+        buffer.truncate()
+        self.writer.writerow(list(_encode_row(row)))
+        return buffer.getvalue().strip().decode('utf-8')
+
+
 def _encode_row(row, encoding='utf-8'):
     for cell in row:
         if cell is not None:
@@ -303,6 +903,14 @@ class SequenceToStringConverter(Converter):
     """
     I'd really like to have the converter options on the init but ruledispatch
     won't let me pass keyword arguments
+
+    Sequences of integers or floats can be converted to a NumPy ndarray
+    instead of a list with the converter option output='numpy', or to an
+    array.array of C longs or doubles with output='array', taking a fraction
+    of the memory. Both are formatted without converting every item
+    separately. When NumPy is not installed, the items are not numbers or,
+    for output='array', an integer does not fit in a C long, the usual list
+    is returned.
     """
     
     def __init__(self, schema_type, **k):
@@ -311,66 +919,308 @@ class SequenceToStringConverter(Converter):
     def from_type(self, value, converter_options={}):
         if value is None:
             return None
-        delimiter = converter_options.get('delimiter',',')
-        if isinstance(self.schema_type.attr, schemaish.Sequence):
-            out = []
+        return '\n'.join(self.iter_from_type(value, converter_options))
+
+    def iter_from_type(self, value, converter_options={}):
+        """
+        Convert value to CSV, yielding one line (without line terminator) at
+        a time. A sequence of simple types is a single line.
+        """
+        if _is_ndarray(value) or isinstance(value, array.array):
+            line = self._format_numbers(value, converter_options)
+            if line is not None:
+                yield line
+                return
+        formatter = _RowFormatter(converter_options.get('delimiter',','))
+        format = formatter.format
+        for row in self._iter_rows(value):
+            yield format(row)
+
+    def write_to(self, value, fileobj, converter_options={}):
+        """
+        Write value to fileobj as UTF-8 encoded CSV, one line per row, using
+        a single csv.writer so neither the lines nor the joined string are
+        held in memory.
+        """
+        if value is None:
+            return
+        writer = csv.writer(fileobj, lineterminator='\n', dialect=getDialect(
+            delimiter=converter_options.get('delimiter',',')))
+        writerow = writer.writerow
+        for row in self._iter_rows(value):
+            writerow(list(_encode_row(row)))
+
+    def _iter_rows(self, value):
+        attr = self.schema_type.attr
+        if isinstance(attr, schemaish.Sequence):
+            from_type_many = string_converter(attr.attr).from_type_many
             for line in value:
-                lineitems =  [
-                  string_converter(self.schema_type.attr.attr).from_type(item) \
-                    for item in line]
-                linestring = convert_list_to_csvrow( \
-                    lineitems, delimiter=delimiter)
-                out.append(linestring)
-            return '\n'.join(out)
-        elif isinstance(self.schema_type.attr, schemaish.Tuple):
-            out = []
+                yield from_type_many(line)
+        elif isinstance(attr, schemaish.Tuple):
+            converters = [string_converter(a) for a in attr.attrs]
             for line in value:
-                lineitems =  [
-              string_converter(self.schema_type.attr.attrs[n]).from_type(item) \
-                    for n,item in enumerate(line) ]
-                linestring = convert_list_to_csvrow( \
-                    lineitems, delimiter=delimiter)
-                out.append(linestring)
-            return '\n'.join(out)
- 
+                yield [converters[n].from_type(item)
+                       for n,item in enumerate(line)]
         else:
-            value =  [string_converter(self.schema_type.attr).from_type(v) \
-                      for v in value]
-            return convert_list_to_csvrow(value, delimiter=delimiter)
+            yield string_converter(attr).from_type_many(value)
     
     def to_type(self, value, converter_options={}):
         if value is None:
             return None
+        output = converter_options.get('output')
+        if output == 'numpy':
+            result = self._to_ndarray(value, converter_options)
+            if result is not None:
+                return result
+        elif output == 'array':
+            result = self._to_array(value, converter_options)
+            if result is not None:
+                return result
+        return self._convert_items(self._split(value, converter_options),
+                                   converter_options)
+
+    def _numeric_type(self, types):
+        # The type for the item converter's numbers from types, if any.
+        attr = self.schema_type.attr
+        if isinstance(attr, (schemaish.Sequence, schemaish.Tuple)):
+            return None
+        return types.get(type(string_converter(attr)))
+
+    def _numpy_dtype(self):
+        if not haveNumpy:
+            return None
+        return self._numeric_type(_NUMPY_DTYPES)
+
+    def _to_ndarray(self, value, converter_options):
+        dtype = self._numpy_dtype()
+        if dtype is None:
+            return None
+        delimiter = converter_options.get('delimiter',',')
+        value = value.strip()
+        # Digits and delimiters alone can be handed to numpy.fromstring,
+        # which stops at the first thing that is not a number: an empty
+        # item, say, leaves it short.
+        if dtype == 'int64' and delimiter != '\n' and value:
+            text, sep = _ascii(value), _ascii(delimiter)
+            if text is not None and sep is not None and \
+               not text.translate(None, '0123456789' + sep):
+                result = numpy.fromstring(text, dtype=dtype, sep=sep)
+                # Too big numbers are silently clipped.
+                if len(result) == text.count(sep) + 1 and \
+                   not (result == _INT64_MAX).any():
+                    return result
+        items = self._split(value, converter_options)
+        try:
+            return numpy.array(items, dtype=dtype)
+        except (ValueError, TypeError, OverflowError):
+            pass
+        # Raises a ConvertError with the index of a bad item, or gives
+        # integers too big for int64.
+        converted = string_converter(self.schema_type.attr).to_type_many(items)
+        return numpy.array(converted, dtype=object)
+
+    def _to_array(self, value, converter_options):
+        typecode = self._numeric_type(_ARRAY_TYPECODES)
+        if typecode is None:
+            return None
+        items = self._split(value, converter_options)
+        to_type_many = string_converter(self.schema_type.attr).to_type_many
+        result = array.array(typecode)
+        # Converted a chunk at a time so there is never a full list of
+        # boxed numbers.
+        for start in xrange(0, len(items), _ARRAY_CHUNK):
+            try:
+                converted = to_type_many(items[start:start+_ARRAY_CHUNK])
+            except ConvertError, e:
+                raise ConvertError(e.message, index=start + e.index)
+            try:
+                result.fromlist(converted)
+            except OverflowError:
+                return None
+        return result
+
+    def _format_numbers(self, value, converter_options):
+        # Format an ndarray or array.array in one go.
+        delimiter = converter_options.get('delimiter',',')
+        if self._numeric_type(_ARRAY_TYPECODES) is None or \
+           delimiter in _NUMBER_CHARS:
+            return None
+        if isinstance(value, array.array):
+            if value.typecode in 'cu':
+                return None
+        elif value.ndim != 1 or not (value.dtype.kind in 'iu' or
+                                     value.dtype == numpy.float64):
+            # Smaller floats, e.g. float32, format differently as items
+            # than as the Python floats tolist gives.
+            return None
+        # tolist gives Python numbers, formatted just like a list's items.
+        return unicode(delimiter).join(map(unicode, value.tolist()))
+
+    def to_type_batch_csv(self, value, converter_options={}):
+        """
+        Convert the single CSV string value like to_type, collecting the
+        errors of individual items (or rows, for sequences of sequences or
+        tuples) rather than raising, returning a BatchResult, or None if
+        value is None. A ConvertError is still raised if value cannot be
+        split into items at all.
+
+        to_type_batch, like to_type_many, takes an iterable of CSV strings
+        and collects the errors of whole sequences.
+        """
+        if value is None:
+            return None
+        items = self._split(value, converter_options)
+        attr = self.schema_type.attr
+        if not isinstance(attr, (schemaish.Sequence, schemaish.Tuple)):
+            return string_converter(attr).to_type_batch(items)
+        convert = self._convert_items
+        out = []
+        append = out.append
+        errors = []
+        for n, row in enumerate(items):
+            try:
+                append(convert([row], converter_options)[0])
+            except ConvertError, e:
+                append(None)
+                errors.append((n, e.message))
+        return BatchResult(out, errors)
+
+    def _split(self, value, converter_options={}):
+        """
+        Split value into the unconverted items to_type would return: rows of
+        cells for sequences of sequences or tuples, otherwise cells.
+        """
         value = value.strip()
         delimiter = converter_options.get('delimiter',',')
-        if isinstance(self.schema_type.attr, schemaish.Sequence):
-            out = []
-            for line in value.split('\n'):
-                l = convert_csvrow_to_list(line, delimiter=delimiter)
-                convl = [
-                 string_converter(self.schema_type.attr.attr).to_type(v) \
-                         for v in l]
-                out.append( convl )
-            return out
-        if isinstance(self.schema_type.attr, schemaish.Tuple):
-            out = []
-            for line in value.split('\n'):
-                l = convert_csvrow_to_list(line, delimiter=delimiter)
-                convl = [string_converter(self.schema_type.attr.attrs[n]).to_type(v) \
-                         for n,v in enumerate(l)]
-                out.append( tuple(convl) )
-            return out
+        if isinstance(self.schema_type.attr,
+                      (schemaish.Sequence, schemaish.Tuple)):
+            lines = (line + '\n' for line in value.split('\n'))
+            return list(_read_rows(lines, delimiter))
+        if delimiter != '\n' and len(value.split('\n')) > 1:
+            raise ConvertError("More than one line found" \
+                       " for csv with delimiter=\'%s\'"%delimiter)
+        if delimiter == '\n':
+            return value.splitlines()
+        if not value:
+            return []
+        if len(delimiter) == 1 and '"' not in value and '\r' not in value \
+           and '\0' not in value:
+            # Without quotes a single line of CSV is simply split.
+            try:
+                return unicode(value).split(delimiter)
+            except UnicodeError:
+                pass
+        return convert_csvrow_to_list(value, delimiter=delimiter)
+
+    def _convert_items(self, items, converter_options={}):
+        """
+        Convert items from _split, or any slice of them.
+        """
+        attr = self.schema_type.attr
+        if isinstance(attr, schemaish.Sequence):
+            convert = string_converter(attr.attr).to_type_many
+        elif isinstance(attr, schemaish.Tuple):
+            converters = [string_converter(a).to_type for a in attr.attrs]
+            def convert(row):
+                return tuple([converters[n](v) for n,v in enumerate(row)])
         else:
-            if delimiter != '\n' and len(value.split('\n')) > 1:
+            return string_converter(attr).to_type_many(items)
+        out = []
+        append = out.append
+        for n, row in enumerate(items):
+            try:
+                append(convert(row))
+            except ConvertError, e:
+                raise ConvertError(e.message, index=n)
+        return out
+
+    def iter_to_type(self, lines, converter_options={}):
+        """
+        Convert a file-like object, or any other iterable of lines, yielding
+        one converted row at a time (a list or tuple, according to the item
+        type) or, for sequences of simple types, one converted item.
+
+        A single csv.reader is run over the whole stream so memory use does
+        not depend on the size of the input and quoted fields may contain
+        newlines. Blank lines between rows are skipped.
+        """
+        delimiter = converter_options.get('delimiter',',')
+        attr = self.schema_type.attr
+        if isinstance(attr, schemaish.Sequence):
+            converter = string_converter(attr.attr)
+            for row in _read_rows(lines, delimiter):
+                yield converter.to_type_many(row)
+        elif isinstance(attr, schemaish.Tuple):
+            converters = [string_converter(a) for a in attr.attrs]
+            for row in _read_rows(lines, delimiter):
+                yield tuple([converters[n].to_type(v)
+                             for n,v in enumerate(row)])
+        elif delimiter == '\n':
+            converter = string_converter(attr)
+            for line in lines:
+                if not isinstance(line, unicode):
+                    line = line.decode('utf-8')
+                yield converter.to_type(line.rstrip('\r\n'))
+        else:
+            converter = string_converter(attr)
+            rows = _read_rows(lines, delimiter)
+            for row in rows:
+                for item in converter.to_type_many(row):
+                    yield item
+                break
+            for row in rows:
                 raise ConvertError("More than one line found" \
                            " for csv with delimiter=\'%s\'"%delimiter)
-            if delimiter == '\n':
-                out = value.splitlines()
-            else:
-                out = convert_csvrow_to_list(value, delimiter=delimiter)
-                
-            return [string_converter(self.schema_type.attr).to_type(v) \
-                    for v in out]
+
+
+_NUMPY_DTYPES = {
+    IntegerToStringConverter: 'int64',
+    FloatToStringConverter: 'float64',
+}
+
+_INT64_MAX = 2**63 - 1
+
+# Python 2's array module has no 'q': a C long is 64 bits on most 64 bit
+# platforms, and integers that do not fit give a list instead.
+_ARRAY_TYPECODES = {
+    IntegerToStringConverter: 'l',
+    FloatToStringConverter: 'd',
+}
+
+_ARRAY_CHUNK = 4096
+
+# Characters str() of a number can contain.
+_NUMBER_CHARS = frozenset('0123456789+-.eEinfa')
+
+
+def _ascii(value):
+    if isinstance(value, unicode):
+        try:
+            return value.encode('ascii')
+        except UnicodeError:
+            return None
+    return value
+
+
+def _is_ndarray(value):
+    # Anything already holding an ndarray has imported numpy.
+    module = sys.modules.get('numpy')
+    return module is not None and isinstance(value, module.ndarray)
+
+
+def _read_rows(lines, delimiter):
+    reader = csv.reader(_encode_lines(lines),
+                        dialect=getDialect(delimiter=delimiter))
+    for row in reader:
+        if row:
+            yield [cell.decode('utf-8') for cell in row]
+
+
+def _encode_lines(lines, encoding='utf-8'):
+    for line in lines:
+        if isinstance(line, unicode):
+            line = line.encode(encoding)
+        yield line
 
 
 class TupleToStringConverter(Converter):
@@ -389,33 +1239,108 @@ class TupleToStringConverter(Converter):
     def from_type(self, value, converter_options={}):
         if value is None:
             return None
-        delimiter = converter_options.get('delimiter',',')
-        lineitems =  [string_converter(self.schema_type.attrs[n]).from_type(item) \
-                      for n,item in enumerate(value)]
-        return convert_list_to_csvrow(lineitems, delimiter=delimiter)
+        return self._codec().format(value,
+                                    converter_options.get('delimiter',','))
     
     def to_type(self, value, converter_options={}):
         if value is None:
             return None
-        value = value.strip()
-        delimiter = converter_options.get('delimiter',',')
-        l = convert_csvrow_to_list(value, delimiter=delimiter)
-        if len(l) > len(self.schema_type.attrs):
-            raise ConvertError('Too many arguments')
-        if len(l) < len(self.schema_type.attrs):
-            raise ConvertError('Too few arguments')
-        def convert_or_none(n, v):
-            v = v.strip()
-            if not v:
-                return None
-            return string_converter(self.schema_type.attrs[n]).to_type(v)
-        return tuple(convert_or_none(n, v) for (n, v) in enumerate(l))
+        return self._codec().parse(value,
+                                   converter_options.get('delimiter',','))
+
+    def from_type_many(self, values, converter_options={}):
+        format = self._codec().formatter(converter_options.get('delimiter',','))
+        return [None if value is None else format(value) for value in values]
+
+    def to_type_many(self, values, converter_options={}):
+        parse = self._codec().parser(converter_options.get('delimiter',','))
+        out = []
+        append = out.append
+        for n, value in enumerate(values):
+            if value is None:
+                append(None)
+                continue
+            try:
+                append(parse(value))
+            except ConvertError, e:
+                raise ConvertError(e.message, index=n)
+        return out
 
+    def _codec(self):
+        # Versioned by the attrs themselves, so changing them compiles a new
+        # codec rather than reusing a stale one.
+        schema_type = self.schema_type
+        return string_converter.cached(schema_type, 'tuple_codec', _TupleCodec,
+                                       tuple(schema_type.attrs))
 
-class TupleToListConverter(Converter):
 
-    def __init__(self, schema_type, **k):
-        Converter.__init__(self, schema_type, **k)
+class _TupleCodec(object):
+    """
+    Parses and formats the CSV rows of one Tuple schema, with its arity and
+    item converters resolved up front. Each thread gets one csv reader and
+    one writer per delimiter, reused for every row.
+    """
+
+    def __init__(self, schema_type):
+        converters = [string_converter(attr) for attr in schema_type.attrs]
+        self.arity = len(converters)
+        self.from_types = [c.from_type for c in converters]
+        self.to_types = [c.to_type for c in converters]
+        self._local = threading.local()
+
+    def format(self, value, delimiter=','):
+        return self.formatter(delimiter)(value)
+
+    def parse(self, value, delimiter=','):
+        return self.parser(delimiter)(value)
+
+    def formatter(self, delimiter=','):
+        """
+        Return a function formatting one tuple as a CSV string.
+        """
+        from_types = self.from_types
+        format_row = self._reused(_RowFormatter, delimiter).format
+        def format(value):
+            return format_row([from_types[n](item)
+                               for n,item in enumerate(value)])
+        return format
+
+    def parser(self, delimiter=','):
+        """
+        Return a function parsing one CSV string into a tuple. Empty items
+        are None.
+        """
+        to_types = self.to_types
+        arity = self.arity
+        parse_row = self._reused(_RowParser, delimiter).parse
+        def parse(value):
+            row = parse_row(value.strip())
+            if len(row) > arity:
+                raise ConvertError('Too many arguments')
+            if len(row) < arity:
+                raise ConvertError('Too few arguments')
+            out = []
+            append = out.append
+            for n, v in enumerate(row):
+                v = v.strip()
+                if v:
+                    append(to_types[n](v))
+                else:
+                    append(None)
+            return tuple(out)
+        return parse
+
+    def _reused(self, cls, delimiter):
+        local = self._local
+        try:
+            return local.__dict__[cls, delimiter]
+        except KeyError:
+            instance = local.__dict__[cls, delimiter] = cls(delimiter)
+            return instance
+
+
+class TupleToListConverter(LeafConverter):
+    __slots__ = ()
 
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -428,11 +1353,246 @@ class TupleToListConverter(Converter):
         return tuple(value)
 
 
+####
+#
+#  Converter families
+
+
+class ConverterFamily(object):
+    """
+    A generic function from schema types to converters, e.g. string_converter.
+
+    Converter factories are registered for schema classes with when_type (or
+    register) and for individual schema instances with when_object, just as
+    with simplegeneric, whose API this follows. Unlike simplegeneric,
+    dispatch is not repeated for every call:
+
+    * the factory for each concrete schema class is resolved through its MRO
+      once and then found with a single dict lookup;
+    * the converter created for a schema instance is stored on the instance
+      itself, so the cache lives and dies with the schema (a
+      WeakKeyDictionary would be pinned forever by the converter's reference
+      back to its schema_type).
+
+    Both caches are dropped whenever a registration lands: cached converters
+    are tagged with a generation which is then replaced.
+    """
+
+    def __init__(self, default):
+        self.default = default
+        self.name = default.__name__
+        self.__name__ = default.__name__
+        self.__doc__ = default.__doc__
+        self.__module__ = default.__module__
+        self.hits = 0
+        self.misses = 0
+        self._by_type = {}
+        self._by_object = {}
+        self._resolved = {}
+        self._generation = object()
+        _families[self.name] = self
+
+    def __call__(self, schema_type):
+        result = self._lookup(schema_type, self.name, None)
+        if result is _MISSING:
+            self.misses += 1
+            return self._store(schema_type, self.name, None,
+                               self.dispatch(schema_type))
+        self.hits += 1
+        return result
+
+    def dispatch(self, schema_type):
+        """
+        Create a converter for schema_type from the registrations, bypassing
+        the per-instance cache.
+        """
+        if self._by_object:
+            registration = self._by_object.get(id(schema_type))
+            if registration is not None:
+                return registration[1](schema_type)
+        cls = type(schema_type)
+        try:
+            factory = self._resolved[cls]
+        except KeyError:
+            factory = self._resolve(cls)
+        return factory(schema_type)
+
+    def factory(self, schema_class):
+        """
+        Return the converter factory registered for schema_class or, failing
+        that, its nearest base class.
+        """
+        try:
+            return self._resolved[schema_class]
+        except KeyError:
+            return self._resolve(schema_class)
+
+    def _resolve(self, cls):
+        for t in cls.__mro__:
+            factory = self._by_type.get(t)
+            if factory is not None:
+                break
+        else:
+            factory = self.default
+        self._resolved[cls] = factory
+        return factory
+
+    def cached(self, schema_type, key, factory, version=None):
+        """
+        Return factory(schema_type), caching the result on schema_type under
+        key until the next registration with this family. Used for the
+        converters themselves and for anything compiled from them.
+
+        A result cached with a different version, e.g. the schema's attrs
+        when it was compiled, is replaced rather than returned.
+
+        Only the family's own lookups, through calling it, count towards
+        cache_info.
+        """
+        result = self._lookup(schema_type, key, version)
+        if result is _MISSING:
+            result = self._store(schema_type, key, version,
+                                 factory(schema_type))
+        return result
+
+    def _lookup(self, schema_type, key, version):
+        try:
+            cache = schema_type.__dict__['_convertish_cache']
+            if cache.owner == id(schema_type):
+                generation, cached_version, result = cache[key]
+                if generation is self._generation and \
+                   cached_version == version:
+                    return result
+        except (AttributeError, KeyError):
+            pass
+        return _MISSING
+
+    def _store(self, schema_type, key, version, result):
+        try:
+            attrs = schema_type.__dict__
+        except AttributeError:
+            # No instance dict (e.g. __slots__), nowhere to cache.
+            return result
+        cache = attrs.get('_convertish_cache')
+        if cache is None or cache.owner != id(schema_type):
+            # A shallow copy shares the original's cache; give it its own.
+            cache = attrs['_convertish_cache'] = _SchemaCache(id(schema_type))
+        cache[key] = (self._generation, version, result)
+        return result
+
+    def when_type(self, *types):
+        """
+        Decorator registering a converter factory for the given schema types.
+        """
+        for t in types:
+            if not isinstance(t, type):
+                raise TypeError("%r is not a type or class" % (t,))
+        def decorate(f):
+            for t in types:
+                if self._by_type.setdefault(t, f) is not f:
+                    raise TypeError("%r already has method for type %r" %
+                                    (self, t))
+            self.cache_clear()
+            return f
+        return decorate
+
+    def when_object(self, *obs):
+        """
+        Decorator registering a converter factory for the given schema
+        instances.
+        """
+        def decorate(f):
+            for o in obs:
+                if self._by_object.setdefault(id(o), (o, f))[1] is not f:
+                    raise TypeError("%r already has method for object %r" %
+                                    (self, o))
+            self.cache_clear()
+            return f
+        return decorate
+
+    def register(self, schema_class, converter_class):
+        """
+        Use converter_class (or any factory taking the schema instance) for
+        schema_class, replacing any existing registration.
+        """
+        if not isinstance(schema_class, type):
+            raise TypeError("%r is not a type or class" % (schema_class,))
+        self._by_type[schema_class] = converter_class
+        self.cache_clear()
+
+    def has_type(self, t):
+        return t in self._by_type
+
+    def has_object(self, o):
+        return id(o) in self._by_object
+
+    def cache_info(self):
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def cache_clear(self):
+        self._resolved = {}
+        self._generation = object()
+
+    def __repr__(self):
+        return '<ConverterFamily %s>' % self.name
+
+
+_families = {}
+
+_MISSING = object()
+
+
+class _SchemaCache(dict):
+    """
+    The converters cached on a schema instance, whose id is owner. Pickling
+    or deep copying the schema gives an empty cache, as compiled converters
+    may not be picklable and belong to the original schema anyway. A shallow
+    copy shares the original's cache, which is ignored because the copy is
+    not its owner.
+    """
+
+    def __init__(self, owner=None):
+        dict.__init__(self)
+        self.owner = owner
+
+    def __reduce__(self):
+        return (_SchemaCache, ())
+
+
+def register(family, schema_class, converter_class):
+    """
+    Register converter_class for schema_class with a converter family, given
+    by name ('string', 'json', ...) or as the family itself, replacing any
+    existing registration. e.g.
+
+        register('string', schemaish.Decimal, MoneyToStringConverter)
+    """
+    _family(family).register(schema_class, converter_class)
+
+
+def _family(family):
+    if isinstance(family, ConverterFamily):
+        return family
+    try:
+        return _families['%s_converter' % family]
+    except KeyError:
+        raise ValueError('Unknown converter family %r' % (family,))
+
+
+def converter_cache_info():
+    """
+    Return the cache hit/miss counters for every converter family, keyed by
+    family name.
+    """
+    return dict((name, family.cache_info())
+                for name, family in _families.items())
+
+
 ####
 #
 #  String Converter
     
-@generic
+@ConverterFamily
 def string_converter(schema_type):
     pass
 
@@ -485,7 +1645,7 @@ def file_to_string(schema_type):
 #
 #  Date Tuple Converter
 
-@generic
+@ConverterFamily
 def datetuple_converter(schema_type):
     pass
 
@@ -498,7 +1658,7 @@ def date_to_datetuple(schema_type):
 #
 #  Boolean Converter
 
-@generic
+@ConverterFamily
 def boolean_converter(schema_type):
     pass
 
@@ -506,7 +1666,7 @@ def boolean_converter(schema_type):
 def boolean_to_boolean(schema_type):
     return NullConverter(schema_type)
 
-@generic
+@ConverterFamily
 def file_converter(schema_type):
     pass
 
@@ -520,7 +1680,10 @@ def file_to_file(schema_type):
 #  JSON Converter
 
 
-class DateToJSONConverter(Converter):
+class DateToJSONConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
     
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -541,7 +1704,10 @@ class DateToJSONConverter(Converter):
         return value
 
 
-class TimeToJSONConverter(Converter):
+class TimeToJSONConverter(LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
     
     def from_type(self, value, converter_options={}):
         if value is None:
@@ -562,7 +1728,56 @@ class TimeToJSONConverter(Converter):
         return value
 
 
-@generic
+if haveDecimal:
+
+    class DecimalToJSONConverter(DecimalConverter):
+        """
+        Convert a Decimal to and from JSON without going through a float.
+
+        By default a Decimal is represented as a string. With a json_format
+        (class attribute or converter option) of 'scaled' it is an integer
+        count of units of the quantize exponent instead, e.g. Decimal('1.25')
+        is 125 with quantize=-2. to_type accepts either, and floats are read
+        from their repr rather than their binary value.
+        """
+
+        __slots__ = ()
+
+        json_format = 'string'
+
+        def from_type(self, value, converter_options={}):
+            if value is None:
+                return None
+            engine = self._engine(converter_options)
+            if converter_options.get('json_format', self.json_format) == \
+               'scaled':
+                return self._scaled_engine(engine).scaled(value)
+            return engine.format(value)
+
+        def to_type(self, value, converter_options={}):
+            if value is None:
+                return None
+            engine = self._engine(converter_options)
+            if isinstance(value, basestring):
+                return engine.parse(value)
+            if isinstance(value, float):
+                return engine.parse(repr(value))
+            if converter_options.get('json_format', self.json_format) == \
+               'scaled':
+                return self._scaled_engine(engine).unscaled(value)
+            try:
+                return engine.quantized(decimal.Decimal(value))
+            except (TypeError, ValueError, ArithmeticError):
+                raise ConvertError("Not a valid number")
+
+        def _scaled_engine(self, engine):
+            if engine.exponent is None:
+                raise ValueError('Scaled JSON decimals need a quantize '
+                                 'exponent')
+            return engine
+
+
+@ConverterFamily
 def json_converter(schema_type):
     pass
 
@@ -578,10 +1793,9 @@ def int_to_json(schema_type):
 def float_to_json(schema_type):
     return NullConverter(schema_type)
 
-# XXX
 @json_converter.when_type(schemaish.Decimal)
 def decimal_to_json(schema_type):
-    return NullConverter(schema_type)
+    return DecimalToJSONConverter(schema_type)
 
 @json_converter.when_type(schemaish.Date)
 def date_to_json(schema_type):
@@ -607,3 +1821,563 @@ def boolean_to_json(schema_type):
 def file_to_json(schema_type):
     return FileToStringConverter(schema_type)
 
+
+
+
+####
+#
+#  Binary Converter
+
+
+# Every value starts with a tag byte: 0 is None, the others say how the rest
+# of the value is laid out. Lengths and counts are unsigned 32 bit, all
+# little-endian.
+_NONE = '\x00'
+_TAG = struct.Struct('<B')
+_LENGTH = struct.Struct('<I')
+_OPTIONAL_LENGTH = struct.Struct('<i')
+_TAGGED_LENGTH = struct.Struct('<BI')
+_INTEGER = struct.Struct('<Bq')
+_FLOAT = struct.Struct('<Bd')
+_DATE = struct.Struct('<BHBB')
+_TIME = struct.Struct('<BBBBI')
+_TZ_TIME = struct.Struct('<BBBBIh')
+_DATETIME = struct.Struct('<BHBBBBBI')
+_TZ_DATETIME = struct.Struct('<BHBBBBBIh')
+_INT64_MIN = -2**63
+# struct silently truncates anything else packed as an integer, e.g. floats.
+_INTEGER_TYPES = frozenset([int, long, bool])
+
+
+def _read_bytes(buf, offset):
+    """
+    Return the length prefixed bytes at offset of buf and the offset after
+    them.
+    """
+    length = _LENGTH.unpack_from(buf, offset)[0]
+    start = offset + 4
+    return _slice(buf, start, start + length), start + length
+
+
+def _read_optional_bytes(buf, offset):
+    length = _OPTIONAL_LENGTH.unpack_from(buf, offset)[0]
+    start = offset + 4
+    if length < 0:
+        return None, start
+    return _slice(buf, start, start + length), start + length
+
+
+def _write_optional_bytes(data, write):
+    if data is None:
+        write(_OPTIONAL_LENGTH.pack(-1))
+    else:
+        write(_OPTIONAL_LENGTH.pack(len(data)))
+        write(data)
+
+
+def _slice(buf, start, end):
+    data = buf[start:end]
+    if len(data) != end - start:
+        raise ConvertError('Truncated binary data')
+    if isinstance(data, memoryview):
+        return data.tobytes()
+    if not isinstance(data, str):
+        return str(data)
+    return data
+
+
+def _utc_minutes(value):
+    if value.tzinfo is None:
+        return None
+    delta = value.utcoffset()
+    if delta is None:
+        return None
+    return delta.days * 1440 + delta.seconds // 60
+
+
+def _bad_tag(tag):
+    return ConvertError('Invalid binary tag %d' % tag)
+
+
+class BinaryConverter(Converter):
+    """
+    Base for converters to and from a compact binary encoding, for caches
+    and queues rather than people.
+
+    from_type returns a str. to_type accepts a str, bytearray, buffer or
+    memoryview and reads fixed size fields straight out of it with
+    struct.unpack_from, so a value can be decoded from a slice of a larger
+    buffer without copying it first. Only the bytes of strings, decimals
+    and files are copied out.
+
+    Subclasses implement pack(value, write), calling write with the encoded
+    parts, and unpack(buf, offset), returning the value and the offset after
+    it, so converters of sequences and tuples can nest their items' encoding.
+    """
+
+    __slots__ = ()
+
+    # The struct format of one value in the arrays SequenceToBinaryConverter
+    # packs sequences of these into, if they can be packed.
+    packed = None
+
+    def from_type(self, value, converter_options={}):
+        if value is None:
+            return None
+        parts = []
+        self.pack(value, parts.append)
+        return ''.join(parts)
+
+    def to_type(self, value, converter_options={}):
+        if value is None:
+            return None
+        try:
+            result, end = self.unpack(value, 0)
+        except struct.error:
+            raise ConvertError('Truncated binary data')
+        except (TypeError, ValueError, ArithmeticError), e:
+            raise ConvertError('Invalid binary data: %s' % e)
+        if end != len(value):
+            raise ConvertError('Unexpected data after binary value')
+        return result
+
+    def pack(self, value, write):
+        raise NotImplementedError()
+
+    def unpack(self, buf, offset):
+        raise NotImplementedError()
+
+
+class LeafBinaryConverter(BinaryConverter, LeafConverter):
+    __slots__ = ()
+
+    memoizable = True
+
+
+class StringToBinaryConverter(LeafBinaryConverter):
+    """
+    UTF-8 encoded. Decodes to unicode.
+    """
+
+    __slots__ = ()
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+            return
+        if isinstance(value, unicode):
+            value = value.encode('utf-8')
+        write(_TAGGED_LENGTH.pack(1, len(value)))
+        write(value)
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 0:
+            return None, offset + 1
+        if tag == 1:
+            data, offset = _read_bytes(buf, offset + 1)
+            return data.decode('utf-8'), offset
+        raise _bad_tag(tag)
+
+
+class IntegerToBinaryConverter(LeafBinaryConverter):
+    """
+    A signed 64 bit integer, or its digits for integers that do not fit.
+    """
+
+    __slots__ = ()
+
+    packed = 'q'
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+        elif not isinstance(value, (int, long)):
+            raise ValueError('Not an integer: %r' % (value,))
+        elif _INT64_MIN <= value <= _INT64_MAX:
+            write(_INTEGER.pack(1, value))
+        else:
+            digits = str(value)
+            write(_TAGGED_LENGTH.pack(2, len(digits)))
+            write(digits)
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 1:
+            return _INTEGER.unpack_from(buf, offset)[1], offset + 9
+        if tag == 0:
+            return None, offset + 1
+        if tag == 2:
+            digits, offset = _read_bytes(buf, offset + 1)
+            return int(digits), offset
+        raise _bad_tag(tag)
+
+
+class FloatToBinaryConverter(LeafBinaryConverter):
+    """
+    An IEEE 754 double.
+    """
+
+    __slots__ = ()
+
+    packed = 'd'
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+        else:
+            write(_FLOAT.pack(1, value))
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 1:
+            return _FLOAT.unpack_from(buf, offset)[1], offset + 9
+        if tag == 0:
+            return None, offset + 1
+        raise _bad_tag(tag)
+
+
+class DecimalToBinaryConverter(LeafBinaryConverter):
+    """
+    The decimal's string, so it is exact whatever its precision.
+    """
+
+    __slots__ = ()
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+            return
+        text = str(value)
+        write(_TAGGED_LENGTH.pack(1, len(text)))
+        write(text)
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 0:
+            return None, offset + 1
+        if tag == 1:
+            text, offset = _read_bytes(buf, offset + 1)
+            try:
+                return decimal.Decimal(text), offset
+            except decimal.InvalidOperation:
+                raise ConvertError('Not a valid number')
+        raise _bad_tag(tag)
+
+
+class BooleanToBinaryConverter(LeafBinaryConverter):
+    """
+    The tag alone: 1 for False and 2 for True.
+    """
+
+    __slots__ = ()
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+        elif value:
+            write('\x02')
+        else:
+            write('\x01')
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 0:
+            return None, offset + 1
+        if tag == 1:
+            return False, offset + 1
+        if tag == 2:
+            return True, offset + 1
+        raise _bad_tag(tag)
+
+
+class DateToBinaryConverter(LeafBinaryConverter):
+    __slots__ = ()
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+        else:
+            write(_DATE.pack(1, value.year, value.month, value.day))
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 1:
+            t, year, month, day = _DATE.unpack_from(buf, offset)
+            return date(year, month, day), offset + _DATE.size
+        if tag == 0:
+            return None, offset + 1
+        raise _bad_tag(tag)
+
+
+class TimeToBinaryConverter(LeafBinaryConverter):
+    """
+    Times with a timezone keep its UTC offset in minutes and decode with a
+    SimpleTZInfo.
+    """
+
+    __slots__ = ()
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+            return
+        minutes = _utc_minutes(value)
+        if minutes is None:
+            write(_TIME.pack(1, value.hour, value.minute, value.second,
+                             value.microsecond))
+        else:
+            write(_TZ_TIME.pack(2, value.hour, value.minute, value.second,
+                                value.microsecond, minutes))
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 1:
+            t, hour, minute, second, microsecond = \
+                    _TIME.unpack_from(buf, offset)
+            return (time(hour, minute, second, microsecond),
+                    offset + _TIME.size)
+        if tag == 2:
+            t, hour, minute, second, microsecond, minutes = \
+                    _TZ_TIME.unpack_from(buf, offset)
+            return (time(hour, minute, second, microsecond,
+                         SimpleTZInfo(minutes)),
+                    offset + _TZ_TIME.size)
+        if tag == 0:
+            return None, offset + 1
+        raise _bad_tag(tag)
+
+
+class DateTimeToBinaryConverter(LeafBinaryConverter):
+    """
+    Like TimeToBinaryConverter, with the date in front.
+    """
+
+    __slots__ = ()
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+            return
+        minutes = _utc_minutes(value)
+        if minutes is None:
+            write(_DATETIME.pack(1, value.year, value.month, value.day,
+                                 value.hour, value.minute, value.second,
+                                 value.microsecond))
+        else:
+            write(_TZ_DATETIME.pack(2, value.year, value.month, value.day,
+                                    value.hour, value.minute, value.second,
+                                    value.microsecond, minutes))
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 1:
+            fields = _DATETIME.unpack_from(buf, offset)
+            return datetime(*fields[1:]), offset + _DATETIME.size
+        if tag == 2:
+            fields = _TZ_DATETIME.unpack_from(buf, offset)
+            return (datetime(*fields[1:-1] + (SimpleTZInfo(fields[-1]),)),
+                    offset + _TZ_DATETIME.size)
+        if tag == 0:
+            return None, offset + 1
+        raise _bad_tag(tag)
+
+
+class FileToBinaryConverter(LeafBinaryConverter):
+    """
+    The filename, mimetype and content (read from the file) of a File. The
+    metadata is not kept. Decodes to a File reading from a StringIO, or with
+    no file if the original had none.
+    """
+
+    __slots__ = ()
+
+    memoizable = False
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+            return
+        write('\x01')
+        for text in (value.filename, value.mimetype):
+            if isinstance(text, unicode):
+                text = text.encode('utf-8')
+            _write_optional_bytes(text, write)
+        if value.file:
+            _write_optional_bytes(value.file.read(), write)
+        else:
+            _write_optional_bytes(None, write)
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 0:
+            return None, offset + 1
+        if tag != 1:
+            raise _bad_tag(tag)
+        filename, offset = _read_optional_bytes(buf, offset + 1)
+        mimetype, offset = _read_optional_bytes(buf, offset)
+        content, offset = _read_optional_bytes(buf, offset)
+        if filename is not None:
+            filename = filename.decode('utf-8')
+        if mimetype is not None:
+            mimetype = mimetype.decode('utf-8')
+        if content is not None:
+            content = StringIO(content)
+        return schemaish.type.File(content, filename, mimetype), offset
+
+
+class SequenceToBinaryConverter(BinaryConverter):
+    """
+    The number of items followed by each item.
+
+    Sequences of integers or floats with no None items are packed as an
+    array of 64 bit integers or doubles instead, with no tag per item, and
+    are converted with a single struct call.
+    """
+
+    def __init__(self, schema_type, **k):
+        Converter.__init__(self, schema_type, **k)
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+            return
+        converter = binary_converter(self.schema_type.attr)
+        if converter.packed and value and (converter.packed != 'q' or
+                                           _INTEGER_TYPES.issuperset(
+                                               map(type, value))):
+            try:
+                data = struct.pack('<%d%s' % (len(value), converter.packed),
+                                   *value)
+            except struct.error:
+                # None or an integer too big for 64 bits.
+                pass
+            else:
+                write(_TAGGED_LENGTH.pack(2, len(value)))
+                write(data)
+                return
+        write(_TAGGED_LENGTH.pack(1, len(value)))
+        pack = converter.pack
+        for item in value:
+            pack(item, write)
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 0:
+            return None, offset + 1
+        count = _LENGTH.unpack_from(buf, offset + 1)[0]
+        offset += 5
+        converter = binary_converter(self.schema_type.attr)
+        if tag == 2 and converter.packed:
+            format = '<%d%s' % (count, converter.packed)
+            return (list(struct.unpack_from(format, buf, offset)),
+                    offset + struct.calcsize(format))
+        if tag != 1:
+            raise _bad_tag(tag)
+        unpack = converter.unpack
+        out = []
+        append = out.append
+        for n in xrange(count):
+            item, offset = unpack(buf, offset)
+            append(item)
+        return out, offset
+
+
+class TupleToBinaryConverter(BinaryConverter):
+    """
+    The number of items followed by each item, which must match the arity of
+    the tuple.
+    """
+
+    def __init__(self, schema_type, **k):
+        Converter.__init__(self, schema_type, **k)
+
+    def pack(self, value, write):
+        if value is None:
+            write(_NONE)
+            return
+        packs = self._items()[0]
+        if len(value) != len(packs):
+            raise ValueError('Expected a tuple of %d items' % len(packs))
+        write(_TAGGED_LENGTH.pack(1, len(value)))
+        for n, item in enumerate(value):
+            packs[n](item, write)
+
+    def unpack(self, buf, offset):
+        tag = _TAG.unpack_from(buf, offset)[0]
+        if tag == 0:
+            return None, offset + 1
+        if tag != 1:
+            raise _bad_tag(tag)
+        unpacks = self._items()[1]
+        count = _LENGTH.unpack_from(buf, offset + 1)[0]
+        if count > len(unpacks):
+            raise ConvertError('Too many arguments')
+        if count < len(unpacks):
+            raise ConvertError('Too few arguments')
+        offset += 5
+        out = []
+        append = out.append
+        for unpack in unpacks:
+            item, offset = unpack(buf, offset)
+            append(item)
+        return tuple(out), offset
+
+    def _items(self):
+        schema_type = self.schema_type
+        return binary_converter.cached(schema_type, 'binary_items',
+                                       _binary_items, tuple(schema_type.attrs))
+
+
+def _binary_items(schema_type):
+    converters = [binary_converter(attr) for attr in schema_type.attrs]
+    return [c.pack for c in converters], [c.unpack for c in converters]
+
+
+@ConverterFamily
+def binary_converter(schema_type):
+    pass
+
+@binary_converter.when_type(schemaish.String)
+def string_to_binary(schema_type):
+    return StringToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Integer)
+def int_to_binary(schema_type):
+    return IntegerToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Float)
+def float_to_binary(schema_type):
+    return FloatToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Decimal)
+def decimal_to_binary(schema_type):
+    return DecimalToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Date)
+def date_to_binary(schema_type):
+    return DateToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Time)
+def time_to_binary(schema_type):
+    return TimeToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.DateTime)
+def datetime_to_binary(schema_type):
+    return DateTimeToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Sequence)
+def sequence_to_binary(schema_type):
+    return SequenceToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Tuple)
+def tuple_to_binary(schema_type):
+    return TupleToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.Boolean)
+def boolean_to_binary(schema_type):
+    return BooleanToBinaryConverter(schema_type)
+
+@binary_converter.when_type(schemaish.File)
+def file_to_binary(schema_type):
+    return FileToBinaryConverter(schema_type)
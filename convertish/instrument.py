@@ -0,0 +1,225 @@
+"""
+Opt-in instrumentation of converters and converter families.
+
+    from convertish import instrument
+    instrument.enable()
+    ... convert things ...
+    stats = instrument.snapshot()
+    instrument.disable()
+
+While enabled, every to_type, from_type, to_type_many and from_type_many
+call and every converter family dispatch (string_converter(schema_type) etc.)
+is timed. Statistics are kept per converter class, method and schema type,
+e.g. 'IntegerToStringConverter.to_type[Integer]', and per family and schema
+type, e.g. 'string_converter[Integer]'. For each the snapshot reports:
+
+  calls, errors (any exception), convert_errors (ConvertError only),
+  total_time, mean, p50, p90 and p99 (seconds) and bytes_in and bytes_out
+  (the length of string arguments and results, including strings in list
+  and tuple arguments and results).
+
+Percentiles come from a histogram of power of two microsecond buckets and
+are the upper bound of the bucket they fall in.
+
+Instrumentation works by replacing the methods on the converter classes that
+exist when enable() is called, and disable() puts the originals back, so it
+costs nothing when disabled. Call enable() again to pick up converter
+classes defined later.
+
+Both enable() and disable() clear the caches of every converter family, so
+the tuple codecs, JSON writers and the like compiled from converter methods
+are compiled again with or without instrumentation. Plans made with
+compile_plan, or converter methods held elsewhere, keep the methods they
+were made with: recompile them after enabling or disabling.
+"""
+__all__ = ['enable', 'disable', 'enabled', 'snapshot', 'reset']
+
+import math
+import threading
+from timeit import default_timer as timer
+
+from convertish.convert import Converter, ConverterFamily, ConvertError, \
+        _families
+
+
+_METHODS = ('to_type', 'from_type', 'to_type_many', 'from_type_many')
+_BUCKETS = 48
+
+_lock = threading.Lock()
+_stats = {}
+_originals = []
+
+
+class _Stats(object):
+
+    __slots__ = ('calls', 'errors', 'convert_errors', 'total_time',
+                 'bytes_in', 'bytes_out', 'buckets')
+
+    def __init__(self):
+        self.calls = self.errors = self.convert_errors = 0
+        self.bytes_in = self.bytes_out = 0
+        self.total_time = 0.0
+        self.buckets = [0] * _BUCKETS
+
+    def percentile(self, fraction):
+        wanted = self.calls * fraction
+        seen = 0
+        for n, count in enumerate(self.buckets):
+            seen += count
+            if count and seen >= wanted:
+                return 2 ** n / 1e6
+        return 0.0
+
+    def as_dict(self):
+        return {'calls': self.calls, 'errors': self.errors,
+                'convert_errors': self.convert_errors,
+                'total_time': self.total_time,
+                'mean': self.calls and self.total_time / self.calls or 0.0,
+                'p50': self.percentile(0.5), 'p90': self.percentile(0.9),
+                'p99': self.percentile(0.99),
+                'bytes_in': self.bytes_in, 'bytes_out': self.bytes_out}
+
+
+def _size(value):
+    if isinstance(value, basestring):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum([len(v) for v in value if isinstance(v, basestring)])
+    return 0
+
+
+def _record(key, elapsed, value, result, error):
+    bucket = min(math.frexp(elapsed * 1e6)[1], _BUCKETS - 1)
+    if bucket < 0:
+        bucket = 0
+    _lock.acquire()
+    try:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = _Stats()
+        stats.calls += 1
+        stats.total_time += elapsed
+        stats.buckets[bucket] += 1
+        stats.bytes_in += _size(value)
+        if error is None:
+            stats.bytes_out += _size(result)
+        else:
+            stats.errors += 1
+            if isinstance(error, ConvertError):
+                stats.convert_errors += 1
+    finally:
+        _lock.release()
+
+
+def _instrument_method(name, method):
+    def instrumented(self, value, *a, **k):
+        schema_class = getattr(self, 'schema_class', None) or \
+                type(self.schema_type)
+        key = '%s.%s[%s]' % (type(self).__name__, name, schema_class.__name__)
+        start = timer()
+        try:
+            result = method(self, value, *a, **k)
+        except Exception, e:
+            _record(key, timer() - start, value, None, e)
+            raise
+        _record(key, timer() - start, value, result, None)
+        return result
+    instrumented.__name__ = method.__name__
+    instrumented.__doc__ = method.__doc__
+    instrumented.__wrapped__ = method
+    return instrumented
+
+
+def _instrument_dispatch(method):
+    def instrumented(self, schema_type):
+        key = '%s[%s]' % (self.name, type(schema_type).__name__)
+        start = timer()
+        try:
+            result = method(self, schema_type)
+        except Exception, e:
+            _record(key, timer() - start, None, None, e)
+            raise
+        _record(key, timer() - start, None, None, None)
+        return result
+    instrumented.__wrapped__ = method
+    return instrumented
+
+
+def _converter_classes(cls=Converter):
+    yield cls
+    for subclass in cls.__subclasses__():
+        for c in _converter_classes(subclass):
+            yield c
+
+
+def _patch(cls, name, wrapper):
+    original = cls.__dict__[name]
+    _originals.append((cls, name, original))
+    setattr(cls, name, wrapper)
+
+
+def enable():
+    """
+    Start instrumenting converters and converter families.
+    """
+    _lock.acquire()
+    try:
+        patched = set([(cls, name) for cls, name, original in _originals])
+        if (ConverterFamily, '__call__') not in patched:
+            _patch(ConverterFamily, '__call__',
+                   _instrument_dispatch(ConverterFamily.__dict__['__call__']))
+        for cls in set(_converter_classes()):
+            for name in _METHODS:
+                if name in cls.__dict__ and (cls, name) not in patched:
+                    _patch(cls, name,
+                           _instrument_method(name, cls.__dict__[name]))
+    finally:
+        _lock.release()
+    _clear_caches()
+
+
+def disable():
+    """
+    Stop instrumenting, restoring the original methods. Statistics are kept
+    until reset().
+    """
+    _lock.acquire()
+    try:
+        while _originals:
+            cls, name, original = _originals.pop()
+            setattr(cls, name, original)
+    finally:
+        _lock.release()
+    _clear_caches()
+
+
+def _clear_caches():
+    # Anything compiled from converter methods holds on to them.
+    for family in _families.values():
+        family.cache_clear()
+
+
+def enabled():
+    return bool(_originals)
+
+
+def snapshot():
+    """
+    Return the statistics gathered so far as a dict of dicts.
+    """
+    _lock.acquire()
+    try:
+        return dict((key, stats.as_dict()) for key, stats in _stats.items())
+    finally:
+        _lock.release()
+
+
+def reset():
+    """
+    Throw away all statistics gathered so far.
+    """
+    _lock.acquire()
+    try:
+        _stats.clear()
+    finally:
+        _lock.release()
@@ -0,0 +1,149 @@
+"""
+ISO 8601 date and time parsing.
+
+The canonical forms written by the isoformat() methods - YYYY-MM-DD,
+HH:MM:SS[.ffffff][+HH:MM|-HH:MM|Z] and the two joined by a 'T' - are parsed by
+slicing at fixed offsets. Anything else falls back to regular expressions that
+accept the more general forms, e.g. unpadded fields, HH:MM, fractions of any
+length and +HHMM offsets.
+
+All parse errors are raised as ValueError; an empty message means the value
+was not recognised at all.
+"""
+__all__ = ['parse_date', 'parse_time', 'parse_datetime', 'parse_many']
+
+import re
+from datetime import date, time, datetime
+
+from convertish.util import SimpleTZInfo
+
+
+_DATE_RE = re.compile(r'(\d+)-(\d+)-(\d+)$')
+_TIME_RE = re.compile(r'(\d+):(\d+)(?::(\d+)(?:[.,](\d+))?)?'
+                      r'(?:(Z)|([+-])(\d{1,2}):?(\d\d))?$')
+
+# int() is comparatively slow, so fixed width fields are decoded by looking
+# them up in tables of every possible value. A KeyError from a lookup means
+# the field is not all digits and the general parser should have a go.
+_DIGITS2 = dict(('%02d' % i, i) for i in xrange(100))
+_DIGITS3 = dict(('%03d' % i, i) for i in xrange(1000))
+
+# Canonical offset strings (Z, +HH:MM, -HH:MM) already seen, with their tzinfo.
+_offsets = {}
+
+
+def parse_date(value):
+    """
+    Parse YYYY-MM-DD into a date.
+    """
+    if len(value) == 10 and value[4] == '-' and value[7] == '-':
+        try:
+            return date(_DIGITS2[value[:2]] * 100 + _DIGITS2[value[2:4]],
+                        _DIGITS2[value[5:7]], _DIGITS2[value[8:]])
+        except KeyError:
+            pass
+    match = _DATE_RE.match(value)
+    if match is None:
+        raise ValueError()
+    y, m, d = match.groups()
+    return date(int(y), int(m), int(d))
+
+
+def parse_time(value):
+    """
+    Parse HH:MM[:SS[.ffffff]] with an optional Z or +/-HH:MM offset into a
+    time.
+    """
+    n = len(value)
+    if n >= 8 and value[2] == ':' and value[5] == ':':
+        try:
+            h, m, s = (_DIGITS2[value[:2]], _DIGITS2[value[3:5]],
+                       _DIGITS2[value[6:8]])
+            if n == 8:
+                return time(h, m, s)
+            if value[8] == '.':
+                us = _DIGITS3[value[9:12]] * 1000 + _DIGITS3[value[12:15]]
+                if n == 15:
+                    return time(h, m, s, us)
+                offset = value[15:]
+            else:
+                us = 0
+                offset = value[8:]
+            try:
+                tz = _offsets[offset]
+            except KeyError:
+                tz = _parse_offset(offset)
+            return time(h, m, s, us, tz)
+        except KeyError:
+            pass
+    return _parse_time(value)
+
+
+def _parse_offset(value):
+    if value == 'Z':
+        tz = SimpleTZInfo(0)
+    elif len(value) == 6 and value[3] == ':' and value[0] in '+-':
+        minutes = _DIGITS2[value[1:3]] * 60 + _DIGITS2[value[4:]]
+        if value[0] == '-':
+            minutes = -minutes
+        tz = SimpleTZInfo(minutes)
+    else:
+        raise KeyError(value)
+    _offsets[value] = tz
+    return tz
+
+
+def _parse_time(value):
+    match = _TIME_RE.match(value)
+    if match is None:
+        raise ValueError()
+    h, m, s, fraction, z, sign, tzh, tzm = match.groups()
+    if fraction:
+        us = int((fraction + '00000')[:6])
+    else:
+        us = 0
+    if z:
+        tz = SimpleTZInfo(0)
+    elif sign:
+        minutes = int(tzh) * 60 + int(tzm)
+        if sign == '-':
+            minutes = -minutes
+        tz = SimpleTZInfo(minutes)
+    else:
+        tz = None
+    return time(int(h), int(m), int(s or 0), us, tz)
+
+
+def parse_datetime(value):
+    """
+    Parse a date and a time separated by a 'T' into a datetime.
+    """
+    if len(value) >= 19 and value[10] == 'T':
+        d, t = value[:10], value[11:]
+    else:
+        try:
+            d, t = value.split('T')
+        except ValueError:
+            raise ValueError()
+    return datetime.combine(parse_date(d), parse_time(t))
+
+
+def parse_many(parse, values):
+    """
+    Parse every item of values with one of the parse functions above,
+    returning a list. None values are passed through. A failure is raised as
+    a ValueError with an index attribute giving the failing position.
+    """
+    out = []
+    append = out.append
+    n = 0
+    try:
+        for n, value in enumerate(values):
+            if value is None:
+                append(None)
+            else:
+                append(parse(value))
+    except ValueError, e:
+        e.index = n
+        raise
+    return out
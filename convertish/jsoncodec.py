@@ -0,0 +1,365 @@
+"""
+Schema driven JSON encoding and decoding.
+
+dumps() and dump() write JSON text straight from typed values, in one pass,
+without first building the Python structure json_converter would return. The
+text is the same as encoding that structure, except that the keys of dates
+and times are always in the same order and every key of a Structure is
+written.
+
+>>> import schemaish
+>>> from datetime import date
+>>> from convertish.jsoncodec import dumps
+>>> dumps(schemaish.Sequence(schemaish.Date()), [date(2009, 5, 1)])
+'[{"__type__": "date", "year": 2009, "month": 5, "day": 1}]'
+
+Converters are looked up through json_converter, so registrations made with
+json_converter.when_type are honoured. Values whose converter has no direct
+writer are converted with it and then encoded with the json module.
+
+iterload() goes the other way for large documents: it reads a JSON array from
+a file-like object a chunk at a time and yields each converted item as soon as
+it has been read, so only one item is held in memory at once.
+"""
+__all__ = ['dumps', 'dump', 'iterload']
+
+import codecs
+import json
+import re
+from json.encoder import encode_basestring_ascii
+
+import schemaish
+
+from convertish.convert import json_converter, NullConverter, \
+        DateToJSONConverter, TimeToJSONConverter, TupleToListConverter, \
+        FileToStringConverter
+from convertish.plan import compile_plan
+
+
+def dumps(schema, value):
+    """
+    Serialize value, described by schema, to a JSON formatted str.
+    """
+    out = []
+    _encoder(schema)(value, out.append)
+    return ''.join(out)
+
+
+def dump(schema, value, fp):
+    """
+    Serialize value, described by schema, as JSON to the file-like fp.
+    """
+    _encoder(schema)(value, fp.write)
+
+
+def iterload(schema, fp, chunk_size=64*1024):
+    """
+    Read a JSON array from the file-like fp, yielding its items one at a time
+    converted to the item type of the schemaish.Sequence schema. Byte input
+    is decoded as UTF-8.
+    """
+    if not isinstance(schema, schemaish.Sequence):
+        raise TypeError('iterload needs a Sequence schema, not %r' % schema)
+    convert = compile_plan(schema.attr, family='json')
+    for item in _iter_array(fp, chunk_size):
+        yield convert(item)
+
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_decode = json.JSONDecoder().raw_decode
+
+
+def _iter_array(fp, chunk_size):
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    skip = _WHITESPACE.match
+    buffer, pos, eof = u'', 0, False
+
+    # Reading more data drops everything already consumed from the buffer.
+    def read():
+        data = fp.read(chunk_size)
+        eof = not data
+        if isinstance(data, str):
+            data = decoder.decode(data, eof)
+        return buffer[pos:] + data, 0, eof
+
+    state = 'start'
+    while True:
+        pos = skip(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise ValueError('Unexpected end of JSON array')
+            buffer, pos, eof = read()
+            continue
+        char = buffer[pos]
+        if state == 'start':
+            if char != '[':
+                raise ValueError('Expecting JSON array')
+            pos += 1
+            state = 'first'
+        elif state == 'first' and char == ']':
+            return
+        elif state == 'next':
+            if char == ']':
+                return
+            if char != ',':
+                raise ValueError('Expecting , delimiter: char %d' % pos)
+            pos += 1
+            state = 'item'
+        else:
+            # The item is complete if it decodes and is followed by
+            # something that cannot continue it, otherwise e.g. 12 might
+            # really be the start of 123. Read more only when the item may
+            # be cut short by the end of the buffer, so malformed input
+            # fails at once rather than after reading the rest of fp.
+            try:
+                item, end = _decode(buffer, pos)
+            except ValueError:
+                if eof or not _truncated(buffer, pos):
+                    raise
+                buffer, pos, eof = read()
+                continue
+            if not eof and _NUMBER_TAIL.match(buffer, end).end() == \
+               len(buffer):
+                buffer, pos, eof = read()
+                continue
+            pos = end
+            state = 'next'
+            yield item
+
+
+_NUMBER_TAIL = re.compile(r'[-+0-9.eE]*')
+# Whole strings, so brackets inside them are skipped, a string with no end,
+# brackets and commas.
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*"|"|[][{},]')
+
+
+def _truncated(buffer, pos):
+    """
+    Whether buffer ends inside the item starting at pos, i.e. before a
+    string is closed, a bracket is matched or, outside brackets, a comma or
+    the end of the array is found.
+    """
+    depth = 0
+    for match in _TOKEN.finditer(buffer, pos):
+        token = match.group()
+        if token == '"':
+            return True
+        if token in '[{':
+            depth += 1
+        elif token in ']}':
+            depth -= 1
+            if depth <= 0:
+                return False
+        elif not depth:
+            # A comma after the item.
+            return False
+    return True
+
+
+def _encoder(schema):
+    return json_converter.cached(schema, 'json_encoder', _compile,
+                                 _children(schema))
+
+
+def _children(schema):
+    """
+    The schemas directly inside schema. Writers of Structures, Sequences
+    and Tuples check their children have not changed before every call and
+    otherwise pass the value on to a writer compiled for the new ones.
+    """
+    if isinstance(schema, schemaish.Sequence):
+        return (schema.attr,)
+    if isinstance(schema, (schemaish.Structure, schemaish.Tuple)):
+        return tuple(schema.attrs)
+    return ()
+
+
+def _compile(schema):
+    if isinstance(schema, schemaish.Structure):
+        return _structure_writer(schema)
+    converter = json_converter(schema)
+    if converter is None:
+        raise TypeError('No json converter for %r' % schema)
+    make_writer = _writers.get(type(converter))
+    if make_writer is not None:
+        write = make_writer(schema, converter)
+        if write is not None:
+            return write
+    return _converter_writer(converter)
+
+
+_encode = json.JSONEncoder().encode
+
+
+def _converter_writer(converter):
+    from_type = converter.from_type
+    def write_converted(value, write):
+        write(_encode(from_type(value)))
+    return write_converted
+
+
+def _structure_writer(schema):
+    attrs = schema.attrs[:]
+    fields = []
+    for n, (name, attr) in enumerate(attrs):
+        key = '%s%s: ' % (n and ', ' or '', encode_basestring_ascii(name))
+        fields.append((name, key, _encoder(attr)))
+    def write_structure(value, write):
+        if value is None:
+            write('null')
+            return
+        if schema.attrs != attrs:
+            _encoder(schema)(value, write)
+            return
+        get = value.get
+        write('{')
+        for name, key, write_field in fields:
+            write(key)
+            write_field(get(name), write)
+        write('}')
+    return write_structure
+
+
+def _null_writer(schema, converter):
+    if isinstance(schema, schemaish.Sequence):
+        return _sequence_writer(schema)
+    for cls, write in _leaf_writers:
+        if isinstance(schema, cls):
+            return write
+    return None
+
+
+def _sequence_writer(schema):
+    attr = schema.attr
+    write_item = _encoder(attr)
+    def write_sequence(value, write):
+        if value is None:
+            write('null')
+            return
+        if schema.attr is not attr:
+            _encoder(schema)(value, write)
+            return
+        write('[')
+        first = True
+        for item in value:
+            if first:
+                first = False
+            else:
+                write(', ')
+            write_item(item, write)
+        write(']')
+    return write_sequence
+
+
+def _tuple_writer(schema, converter):
+    attrs = schema.attrs[:]
+    writers = [_encoder(attr) for attr in attrs]
+    fallback = _converter_writer(converter)
+    def write_tuple(value, write):
+        if value is None:
+            write('null')
+            return
+        if schema.attrs != attrs:
+            _encoder(schema)(value, write)
+            return
+        if len(value) != len(writers):
+            fallback(value, write)
+            return
+        write('[')
+        for n, item in enumerate(value):
+            if n:
+                write(', ')
+            writers[n](item, write)
+        write(']')
+    return write_tuple
+
+
+def _write_string(value, write):
+    if value is None:
+        write('null')
+    elif isinstance(value, basestring):
+        write(encode_basestring_ascii(value))
+    else:
+        write(_encode(value))
+
+
+def _write_integer(value, write):
+    if value is None:
+        write('null')
+    elif type(value) in (int, long):
+        write(str(value))
+    else:
+        write(_encode(value))
+
+
+def _write_float(value, write):
+    if type(value) is float and value == value and \
+       value not in (_INFINITY, -_INFINITY):
+        write(repr(value))
+    elif value is None:
+        write('null')
+    else:
+        write(_encode(value))
+
+
+_INFINITY = float('inf')
+
+
+def _write_boolean(value, write):
+    if value is True:
+        write('true')
+    elif value is False:
+        write('false')
+    elif value is None:
+        write('null')
+    else:
+        write(_encode(value))
+
+
+def _date_writer(schema, converter):
+    def write_date(value, write):
+        if value is None:
+            write('null')
+        else:
+            write('{"__type__": "date", "year": %d, "month": %d, "day": %d}' %
+                  (value.year, value.month, value.day))
+    return write_date
+
+
+def _time_writer(schema, converter):
+    def write_time(value, write):
+        if value is None:
+            write('null')
+        else:
+            write('{"__type__": "time", "hour": %d, "minute": %d, '
+                  '"second": %d, "microsecond": %d}' %
+                  (value.hour, value.minute, value.second, value.microsecond))
+    return write_time
+
+
+def _file_writer(schema, converter):
+    def write_file(value, write):
+        if value is None:
+            write('null')
+            return
+        write('"')
+        for chunk in converter.iter_from_type(value):
+            write(encode_basestring_ascii(chunk)[1:-1])
+        write('"')
+    return write_file
+
+
+_leaf_writers = [
+    (schemaish.String, _write_string),
+    (schemaish.Integer, _write_integer),
+    (schemaish.Float, _write_float),
+    (schemaish.Boolean, _write_boolean),
+]
+
+_writers = {
+    NullConverter: _null_writer,
+    DateToJSONConverter: _date_writer,
+    TimeToJSONConverter: _time_writer,
+    TupleToListConverter: _tuple_writer,
+    FileToStringConverter: _file_writer,
+}
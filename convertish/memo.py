@@ -0,0 +1,192 @@
+"""
+Opt-in memoization of to_type for converters of often repeated values.
+
+Columns of dates, booleans, decimals or enum-like strings tend to repeat the
+same few values over and over. Memoizing a schema class's converter keeps the
+most recently used results so repeats are not parsed again:
+
+>>> import schemaish
+>>> from convertish.convert import string_converter
+>>> from convertish.memo import memoize
+>>> memoize(string_converter, schemaish.Date, maxsize=1000)
+>>> converter = string_converter(schemaish.Date())
+>>> converter.to_type('2009-05-01') is converter.to_type('2009-05-01')
+True
+>>> converter.cache_info()['hits']
+1
+
+Only converters whose results are immutable (those with a true memoizable
+attribute) can be memoized, so memoize accepts the String, Integer, Float,
+Decimal, Boolean, Date, Time and DateTime schema classes only. Calls with converter_options, or with values that cannot be
+hashed (e.g. the dicts json_converter's dates convert from), are passed
+straight to the wrapped converter.
+"""
+__all__ = ['memoize', 'MemoConverter']
+
+import heapq
+import itertools
+import threading
+
+import schemaish
+
+from convertish.convert import Converter, ConvertError, _family
+
+
+# Schema classes whose values are immutable.
+_MEMOIZABLE = (schemaish.String, schemaish.Integer, schemaish.Float,
+               schemaish.Decimal, schemaish.Boolean, schemaish.Date,
+               schemaish.Time, schemaish.DateTime)
+
+
+class MemoConverter(Converter):
+    """
+    Wrap a converter, memoizing the results of to_type for up to maxsize
+    values. Safe to share between threads.
+
+    Results are memoized by the type as well as the value, as equal values
+    of different types, e.g. 1, 1.0 and True, may convert differently.
+
+    When the memo is full the least recently used quarter of it is
+    discarded. Hits only stamp the entry with the time of use (an atomic
+    counter) and take no lock, so under concurrent use recency and the
+    statistics are approximate.
+
+    Everything but to_type and to_type_many is passed to the wrapped
+    converter.
+    """
+
+    def __init__(self, converter, maxsize=4096):
+        if not getattr(converter, 'memoizable', False):
+            raise TypeError('Only converters with immutable results can be '
+                            'memoized, not %r' % (converter,))
+        Converter.__init__(self, converter.schema_type)
+        self.converter = converter
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._tick = itertools.count().next
+        self.cache_clear()
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name == 'converter':
+            raise AttributeError(name)
+        return getattr(self.converter, name)
+
+    def from_type(self, value, converter_options={}):
+        return self.converter.from_type(value, converter_options)
+
+    def from_type_many(self, values, converter_options={}):
+        return self.converter.from_type_many(values, converter_options)
+
+    def to_type(self, value, converter_options={}):
+        if converter_options or value is None:
+            return self.converter.to_type(value, converter_options)
+        try:
+            entry = self._cache.get((type(value), value))
+        except TypeError:
+            return self.converter.to_type(value)
+        if entry is None:
+            return self._miss(value)
+        entry[1] = self._tick()
+        self.hits += 1
+        return entry[0]
+
+    def to_type_many(self, values, converter_options={}):
+        if converter_options:
+            return self.converter.to_type_many(values, converter_options)
+        get = self._cache.get
+        tick = self._tick
+        miss = self._miss
+        hits = 0
+        out = []
+        append = out.append
+        try:
+            for n, value in enumerate(values):
+                try:
+                    entry = get((type(value), value))
+                except TypeError:
+                    entry = None
+                if entry is not None:
+                    entry[1] = tick()
+                    hits += 1
+                    append(entry[0])
+                elif value is None:
+                    append(None)
+                else:
+                    append(miss(value))
+        except ConvertError, e:
+            raise ConvertError(e.message, index=n)
+        finally:
+            self.hits += hits
+        return out
+
+    def _miss(self, value):
+        result = self.converter.to_type(value)
+        key = type(value), value
+        self._lock.acquire()
+        try:
+            self.misses += 1
+            cache = self._cache
+            if len(cache) >= self.maxsize and key not in cache:
+                self._evict(cache)
+            cache[key] = [result, self._tick()]
+        except TypeError:
+            # Unhashable.
+            pass
+        finally:
+            self._lock.release()
+        return result
+
+    def _evict(self, cache):
+        count = max(1, len(cache) // 4)
+        for key, entry in heapq.nsmallest(count, cache.iteritems(),
+                                          key=_stamp):
+            del cache[key]
+
+    def cache_info(self):
+        """
+        Return the hits, misses, maxsize, currsize and hit_rate (hits as a
+        fraction of lookups) of the memo.
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses,
+                'maxsize': self.maxsize, 'currsize': len(self._cache),
+                'hit_rate': lookups and float(self.hits) / lookups or 0.0}
+
+    def cache_clear(self):
+        """
+        Forget every memoized result and reset the statistics.
+        """
+        self._lock.acquire()
+        try:
+            self._cache = {}
+            self.hits = self.misses = 0
+        finally:
+            self._lock.release()
+
+    def __repr__(self):
+        return '<MemoConverter %r maxsize=%d>' % (self.converter, self.maxsize)
+
+
+def _stamp(item):
+    return item[1][1]
+
+
+def memoize(family, schema_class, maxsize=4096):
+    """
+    Memoize the converters family ('string', 'json', ... or the family
+    itself) gives for schema_class, so one MemoConverter is shared by every
+    schema of that class.
+    """
+    if not issubclass(schema_class, _MEMOIZABLE):
+        raise TypeError('Values of %r cannot be memoized' % (schema_class,))
+    family = _family(family)
+    factory = family.factory(schema_class)
+    memos = {}
+    def memoizing(schema_type):
+        converter = factory(schema_type)
+        try:
+            return memos[converter]
+        except KeyError:
+            return memos.setdefault(converter,
+                                    MemoConverter(converter, maxsize))
+    family.register(schema_class, memoizing)
@@ -0,0 +1,146 @@
+"""
+Convert large batches of values in several processes.
+
+>>> import schemaish
+>>> from convertish.convert import string_converter
+>>> from convertish.parallel import parallel_to_type
+>>> converter = string_converter(schemaish.Sequence(schemaish.Integer()))
+>>> parallel_to_type(converter, '1,2,3')
+[1, 2, 3]
+
+The values are split into chunks and each chunk is converted by a worker in a
+multiprocessing pool with to_type_many, so the result is the same list
+to_type_many would return, in the same order. A SequenceToStringConverter
+may also be given its whole CSV string: the CSV is parsed in the calling
+process and its items, or rows, are converted by the workers.
+
+Converters are sent to the workers by pickling them along with their schema.
+Cached converters are not pickled; each worker looks them up again.
+
+A ConvertError raised by a worker is raised again with index set to the
+position of the failing value in the whole input, not in its chunk. Batches
+smaller than threshold are not worth the cost of pickling and are converted
+in the calling process.
+
+iconvert() converts a stream instead, e.g. rows as they arrive from a socket
+or a queue, a batch at a time, optionally handing the batches to a thread or
+process pool while the next batch is read.
+"""
+__all__ = ['parallel_to_type', 'iconvert']
+
+import multiprocessing
+from collections import deque
+from itertools import islice
+
+from convertish.convert import ConvertError, SequenceToStringConverter
+
+
+def parallel_to_type(converter, values, workers=None, chunksize=None,
+                     converter_options={}, threshold=10000, pool=None):
+    """
+    Return converter.to_type_many(values) (or converter.to_type(values) for a
+    SequenceToStringConverter and a string), converting chunks of chunksize
+    values in workers processes (default: one per CPU).
+
+    Pass a multiprocessing pool to reuse it across calls; otherwise a pool is
+    created and closed for each call.
+    """
+    if values is None:
+        return None
+    if isinstance(converter, SequenceToStringConverter) and \
+       isinstance(values, basestring):
+        values = converter._split(values, converter_options)
+        task = _Task(converter, '_convert_items', converter_options)
+    else:
+        values = list(values)
+        task = _Task(converter, 'to_type_many', converter_options)
+    if len(values) < threshold:
+        return _result(task((0, values)))
+    if pool is None:
+        workers = workers or multiprocessing.cpu_count()
+    else:
+        workers = workers or len(getattr(pool, '_pool', ())) or 1
+    if not chunksize:
+        chunksize = max(1, -(-len(values) // (workers * 4)))
+    chunks = [(n, values[n:n+chunksize])
+              for n in xrange(0, len(values), chunksize)]
+    own_pool = pool is None
+    if own_pool:
+        pool = multiprocessing.Pool(workers)
+    try:
+        out = []
+        for result in pool.imap(task, chunks):
+            out.extend(_result(result))
+        return out
+    finally:
+        if own_pool:
+            pool.terminate()
+
+
+def iconvert(converter, values, batch_size=1000, pool=None, max_pending=2,
+             converter_options={}, direction='to_type'):
+    """
+    Convert the iterable values in batches of batch_size with converter's
+    to_type_many (or from_type_many, for direction 'from_type'), yielding
+    the converted values in order.
+
+    Given a pool (e.g. multiprocessing.pool.ThreadPool, or a
+    multiprocessing.Pool for CPU heavy converters) batches are converted by
+    the pool. No more than max_pending batches are read ahead of the
+    consumer, so a slow consumer holds back reading from values.
+
+    A ConvertError is raised with index set to the position of the failing
+    value in the whole stream.
+    """
+    if direction not in ('to_type', 'from_type'):
+        raise ValueError('direction must be to_type or from_type')
+    task = _Task(converter, direction + '_many', converter_options)
+    values = iter(values)
+    offset = 0
+    pending = deque()
+    while True:
+        batch = list(islice(values, batch_size))
+        if not batch:
+            break
+        if pool is None:
+            for value in _result(task((offset, batch))):
+                yield value
+        else:
+            pending.append(pool.apply_async(task, ((offset, batch),)))
+            while len(pending) > max_pending:
+                for value in _result(pending.popleft().get()):
+                    yield value
+        offset += len(batch)
+    while pending:
+        for value in _result(pending.popleft().get()):
+            yield value
+
+
+class _Task(object):
+    """
+    Picklable converter call for one chunk. Returns ('ok', values) or
+    ('error', index, message) so ConvertError's index survives the trip back
+    from the worker.
+    """
+
+    def __init__(self, converter, method, converter_options):
+        self.converter = converter
+        self.method = method
+        self.converter_options = converter_options
+
+    def __call__(self, chunk):
+        offset, values = chunk
+        convert = getattr(self.converter, self.method)
+        try:
+            return ('ok', convert(values, self.converter_options))
+        except ConvertError, e:
+            index = e.index
+            if index is not None:
+                index += offset
+            return ('error', index, e.message)
+
+
+def _result(result):
+    if result[0] == 'error':
+        raise ConvertError(result[2], index=result[1])
+    return result[1]
@@ -0,0 +1,112 @@
+"""
+Compiled conversion plans for whole schemaish.Structure trees.
+
+A plan walks a schema once, resolving the converter for every leaf up front,
+and can then convert any number of nested dicts without dispatching again.
+
+>>> import schemaish
+>>> from convertish.plan import compile_plan
+>>> schema = schemaish.Structure([('age', schemaish.Integer())])
+>>> plan = compile_plan(schema)
+>>> plan({'age': '42'})
+{'age': 42}
+"""
+__all__ = ['compile_plan', 'ConversionPlan']
+
+import schemaish
+
+from convertish.convert import NullConverter, TupleToListConverter, \
+        _families
+
+
+class ConversionPlan(object):
+    """
+    Reusable callable that converts a value of a schema in one pass.
+
+    Plans pickle by schema, family and direction and are recompiled when
+    unpickled.
+    """
+
+    def __init__(self, schema, family='string', direction='to_type'):
+        if direction not in ('to_type', 'from_type'):
+            raise ValueError('direction must be to_type or from_type')
+        try:
+            self.converter_family = _families['%s_converter' % family]
+        except KeyError:
+            raise ValueError('Unknown converter family %r' % family)
+        self.schema = schema
+        self.family = family
+        self.direction = direction
+        self._convert = self._compile(schema)
+
+    def __call__(self, value):
+        return self._convert(value)
+
+    def __getstate__(self):
+        return {'schema': self.schema, 'family': self.family,
+                'direction': self.direction}
+
+    def __setstate__(self, state):
+        self.__init__(state['schema'], state['family'], state['direction'])
+
+    def _compile(self, schema):
+        if isinstance(schema, schemaish.Structure):
+            return self._compile_structure(schema)
+        if isinstance(schema, schemaish.Sequence) and \
+           isinstance(schema.attr, schemaish.Structure):
+            return self._compile_sequence(schema)
+        converter = self.converter_family(schema)
+        if converter is None:
+            raise TypeError('No %s converter for %r' % (self.family, schema))
+        # json_converter passes sequences and tuples through as they are;
+        # convert their items as convertish.jsoncodec writes them.
+        if isinstance(schema, schemaish.Sequence) and \
+           type(converter) is NullConverter:
+            convert_item = self._compile(schema.attr)
+            if not _is_null(convert_item):
+                return self._compile_sequence(schema)
+        if isinstance(converter, TupleToListConverter):
+            return self._compile_tuple(schema, converter)
+        return getattr(converter, self.direction)
+
+    def _compile_structure(self, schema):
+        fields = [(name, self._compile(attr)) for name, attr in schema.attrs]
+        def convert(value):
+            if value is None:
+                return None
+            get = value.get
+            return dict([(name, f(get(name))) for name, f in fields])
+        return convert
+
+    def _compile_tuple(self, schema, converter):
+        items = [self._compile(attr) for attr in schema.attrs]
+        fallback = getattr(converter, self.direction)
+        make = self.direction == 'to_type' and tuple or list
+        def convert(value):
+            if value is None:
+                return None
+            if len(value) != len(items):
+                return fallback(value)
+            return make([f(item) for f, item in zip(items, value)])
+        return convert
+
+    def _compile_sequence(self, schema):
+        convert_item = self._compile(schema.attr)
+        def convert(value):
+            if value is None:
+                return None
+            return [convert_item(item) for item in value]
+        return convert
+
+
+def _is_null(convert):
+    return type(getattr(convert, 'im_self', None)) is NullConverter
+
+
+def compile_plan(schema, family='string', direction='to_type'):
+    """
+    Compile a conversion plan for schema using the named converter family
+    ('string' or 'json'). The returned callable converts a whole (nested)
+    value, converting in the given direction, to_type or from_type.
+    """
+    return ConversionPlan(schema, family, direction)
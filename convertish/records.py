@@ -0,0 +1,284 @@
+"""
+Fixed-width binary records for Tuple schemas of numbers, dates and booleans.
+
+A RecordConverter compiles a Tuple schema into a struct layout, so every row
+takes the same number of bytes and many rows can be packed into, and read
+back from, one contiguous buffer:
+
+>>> import schemaish
+>>> from convertish.records import RecordConverter
+>>> converter = RecordConverter(schemaish.Tuple((schemaish.Integer(),
+...                                              schemaish.Float())))
+>>> buf = converter.pack_many([(1, 0.5), (2, None)])
+>>> len(buf) == 2 * converter.size
+True
+>>> list(converter.iter_unpack(buf))
+[(1, 0.5), (2, None)]
+>>> list(converter.iter_column(buf, 0))
+[1, 2]
+
+Rows are read with struct.unpack_from at their offset in the buffer (a str,
+bytearray, buffer or memoryview), so scanning a large buffer, or one item of
+every row with iter_column, never copies it. Only the rows asked for become
+Python objects.
+
+Items are stored as:
+
+  Integer   signed 64 bit integer
+  Float     IEEE 754 double
+  Boolean   one byte
+  Date      32 bit proleptic Gregorian ordinal
+  Time      64 bit microseconds since midnight
+  DateTime  64 bit microseconds since 0001-01-01
+
+Times and datetimes must not have a timezone. Each record starts with a
+bitmask of its None items, so tuples of up to 64 items are supported. Use
+binary_converter for anything else.
+"""
+__all__ = ['RecordConverter']
+
+import struct
+from datetime import date, datetime, time, timedelta
+
+import schemaish
+
+from convertish.convert import Converter, ConvertError
+
+
+_EPOCH = datetime(1, 1, 1)
+
+
+def _time_from_type(value):
+    if value.tzinfo is not None:
+        raise ValueError('Records cannot store timezone-aware times')
+    return (((value.hour * 60 + value.minute) * 60 + value.second) *
+            1000000 + value.microsecond)
+
+
+def _time_to_type(value):
+    seconds, microsecond = divmod(value, 1000000)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, microsecond)
+
+
+def _datetime_from_type(value):
+    if value.tzinfo is not None:
+        raise ValueError('Records cannot store timezone-aware datetimes')
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+
+def _datetime_to_type(value):
+    return _EPOCH + timedelta(microseconds=value)
+
+
+# Schema class: (struct format, from_type, to_type). None is no conversion.
+_FIELDS = {
+    schemaish.Integer: ('q', None, None),
+    schemaish.Float: ('d', None, None),
+    schemaish.Boolean: ('?', None, None),
+    schemaish.Date: ('i', date.toordinal, date.fromordinal),
+    schemaish.Time: ('q', _time_from_type, _time_to_type),
+    schemaish.DateTime: ('q', _datetime_from_type, _datetime_to_type),
+}
+
+_MASKS = [(8, 'B'), (16, 'H'), (32, 'I'), (64, 'Q')]
+
+
+def _field(attr):
+    for cls in type(attr).__mro__:
+        if cls in _FIELDS:
+            return _FIELDS[cls]
+    raise TypeError('Records cannot store %r' % (attr,))
+
+
+class RecordConverter(Converter):
+    """
+    Convert the tuples of a Tuple schema to and from fixed-width records of
+    size bytes.
+
+    from_type and to_type convert a single record; pack_many, pack_into,
+    unpack_from, iter_unpack and iter_column work on buffers of many.
+    """
+
+    def __init__(self, schema_type, **k):
+        Converter.__init__(self, schema_type, **k)
+        fields = [_field(attr) for attr in schema_type.attrs]
+        self.arity = len(fields)
+        for limit, mask in _MASKS:
+            if self.arity <= limit:
+                break
+        else:
+            raise TypeError('Records cannot store more than 64 items')
+        formats = [f[0] for f in fields]
+        self._struct = struct.Struct('<' + mask + ''.join(formats))
+        self.size = self._struct.size
+        self._mask = mask
+        self._formats = formats
+        self._from_types = [(n, f[1]) for n, f in enumerate(fields) if f[1]]
+        # struct silently truncates floats packed as integers.
+        self._integers = [n for n, f in enumerate(fields) if f[0] == 'q' and
+                          f[1] is None]
+        self._to_types = [(n, f[2]) for n, f in enumerate(fields) if f[2]]
+        self._columns = {}
+
+    def from_type(self, value, converter_options={}):
+        if value is None:
+            return None
+        fields = self._fields(value)
+        try:
+            return self._struct.pack(*fields)
+        except struct.error, e:
+            raise self._pack_error(fields, e)
+
+    def to_type(self, value, converter_options={}):
+        if value is None:
+            return None
+        if len(value) != self.size:
+            raise ConvertError('Expected a record of %d bytes' % self.size)
+        return self._row(self._struct.unpack_from(value))
+
+    def pack_many(self, values):
+        """
+        Pack the tuples in values into a bytearray of consecutive records.
+        """
+        values = list(values)
+        buf = bytearray(len(values) * self.size)
+        pack_into = self._struct.pack_into
+        fields = self._fields
+        size = self.size
+        for n, value in enumerate(values):
+            row = fields(value)
+            try:
+                pack_into(buf, n * size, *row)
+            except struct.error, e:
+                raise self._pack_error(row, e, 'row %d ' % n)
+        return buf
+
+    def pack_into(self, buf, index, value):
+        """
+        Pack value as record number index of the writable buffer buf.
+        """
+        fields = self._fields(value)
+        try:
+            self._struct.pack_into(buf, index * self.size, *fields)
+        except struct.error, e:
+            if index * self.size + self.size > len(buf) or index < 0:
+                raise IndexError('record index out of range')
+            raise self._pack_error(fields, e)
+
+    def unpack_from(self, buf, index):
+        """
+        Return record number index of buf.
+        """
+        try:
+            return self._row(self._struct.unpack_from(buf, index * self.size))
+        except struct.error:
+            raise IndexError('record index out of range')
+
+    def unpack_many(self, buf):
+        """
+        Return a list of the tuples in buf.
+        """
+        return list(self.iter_unpack(buf))
+
+    def iter_unpack(self, buf):
+        """
+        Yield the tuples in buf, one record at a time, without copying buf.
+        """
+        unpack_from = self._struct.unpack_from
+        row = self._row
+        for offset in xrange(0, self._length(buf), self.size):
+            yield row(unpack_from(buf, offset))
+
+    def iter_column(self, buf, n):
+        """
+        Return an iterator of item n of every record in buf, without
+        unpacking the other items.
+        """
+        return self._iter_column(buf, self._column(n),
+                                 dict(self._to_types).get(n), 1 << n)
+
+    def _iter_column(self, buf, column, to_type, bit):
+        unpack_from = column.unpack_from
+        for offset in xrange(0, self._length(buf), self.size):
+            mask, value = unpack_from(buf, offset)
+            if mask & bit:
+                yield None
+            elif to_type is None:
+                yield value
+            else:
+                yield to_type(value)
+
+    def _column(self, n):
+        try:
+            return self._columns[n]
+        except KeyError:
+            pass
+        if not 0 <= n < self.arity:
+            raise IndexError('item index out of range')
+        formats = self._formats
+        before = struct.calcsize('<' + ''.join(formats[:n]))
+        after = struct.calcsize('<' + ''.join(formats[n+1:]))
+        column = struct.Struct('<%s%dx%s%dx' % (self._mask, before,
+                                                formats[n], after))
+        return self._columns.setdefault(n, column)
+
+    def _length(self, buf):
+        length = len(buf)
+        if length % self.size:
+            raise ConvertError('Buffer is not a whole number of %d byte '
+                               'records' % self.size)
+        return length
+
+    def _fields(self, value):
+        if len(value) != self.arity:
+            raise ValueError('Expected a tuple of %d items' % self.arity)
+        for n in self._integers:
+            item = value[n]
+            if not isinstance(item, (int, long)) and item is not None:
+                raise ValueError('Cannot store item %d, %r: not an integer' %
+                                 (n, item))
+        mask = 0
+        if None in value:
+            fields = list(value)
+            for n, item in enumerate(fields):
+                if item is None:
+                    mask |= 1 << n
+                    fields[n] = 0
+        elif self._from_types:
+            fields = list(value)
+        else:
+            return (0,) + tuple(value)
+        for n, from_type in self._from_types:
+            if not mask & 1 << n:
+                fields[n] = from_type(fields[n])
+        fields.insert(0, mask)
+        return fields
+
+    def _pack_error(self, fields, error, where=''):
+        for n, format in enumerate(self._formats):
+            try:
+                struct.pack('<' + format, fields[n + 1])
+            except struct.error, e:
+                return ValueError('Cannot store %sitem %d, %r: %s' %
+                                  (where, n, fields[n + 1], e))
+        return ValueError('Cannot store %s%r: %s' % (where, fields[1:], error))
+
+    def _row(self, fields):
+        mask = fields[0]
+        if not mask and not self._to_types:
+            return fields[1:]
+        row = list(fields[1:])
+        try:
+            for n, to_type in self._to_types:
+                if not mask & 1 << n:
+                    row[n] = to_type(row[n])
+        except (ValueError, OverflowError), e:
+            raise ConvertError('Invalid record: %s' % e)
+        if mask:
+            for n in xrange(self.arity):
+                if mask & 1 << n:
+                    row[n] = None
+        return tuple(row)
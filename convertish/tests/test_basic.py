@@ -1,10 +1,12 @@
 # -*- coding: utf-8
 
 from cStringIO import StringIO
+import csv
 import unittest
 import schemaish
 import schemaish.type
 from datetime import date, datetime, time
+from decimal import Decimal
 
 from convertish.convert import string_converter, datetuple_converter, ConvertError
 from convertish.util import SimpleTZInfo
@@ -57,6 +59,32 @@ class TestConverters(unittest.TestCase):
         actual = string_converter(type).to_type(value)
         self.assertEquals(actual,expected)
 
+    def test_decimal_string_conversion(self):
+        converter = string_converter(schemaish.Decimal())
+        self.assertEquals(converter.from_type(Decimal('1.10')), '1.10')
+        self.assertEquals(converter.to_type(' 1.10 '), Decimal('1.10'))
+        self.assertTrue(converter.to_type('1.10') is converter.to_type('1.10'))
+        self.assertRaises(ConvertError, converter.to_type, 'x')
+
+        options = {'quantize': -2}
+        self.assertEquals(converter.to_type('1.005', options), Decimal('1.00'))
+        self.assertEquals(str(converter.to_type('1.015', options)), '1.02')
+        self.assertEquals(converter.from_type(Decimal('3'), options), '3.00')
+        self.assertEquals(converter.from_type_many([Decimal('3'), None],
+                                                   {'quantize': '0.1'}),
+                          ['3.0', None])
+        options = {'precision': 3}
+        self.assertEquals(str(converter.to_type('1.2345', options)), '1.23')
+        self.assertEquals(converter.from_type(Decimal('1.2345'), options),
+                          '1.23')
+        self.assertEquals(converter.from_type_many([Decimal('-1.2355')],
+                                                   options), ['-1.24'])
+        self.assertEquals(converter.from_type(Decimal('1.2345'),
+                                              {'precision': 3,
+                                               'quantize': -1}), '1.2')
+        self.assertRaises(ConvertError, converter.to_type, '1.2345',
+                          {'precision': 3, 'quantize': -4})
+
     def test_boolean_string_conversion(self):
         type = schemaish.Boolean()
         value = True
@@ -93,6 +121,27 @@ class TestConverters(unittest.TestCase):
         self.assertTrue(file.filename == 'content.txt')
         self.assertTrue(file.file.read() == 'foo')
 
+    def test_file_string_chunked(self):
+        FileType = schemaish.type.File
+        converter = string_converter(schemaish.File())
+        content = u'\xa3abc' * 10
+        chunks = converter.from_type(
+            FileType(StringIO(content.encode('utf-8')), None, None),
+            converter_options={'chunked': True, 'chunk_size': 3})
+        chunks = list(chunks)
+        self.assertTrue(len(chunks) > 1)
+        self.assertEquals(u''.join(chunks), content)
+        self.assertRaises(ValueError, converter.iter_from_type,
+                          FileType(None, None, None))
+
+    def test_file_string_spooled(self):
+        converter = string_converter(schemaish.File())
+        content = u'\xa3abc' * 10
+        file = converter.to_type(u' %s ' % content, converter_options={
+            'spool_threshold': 8, 'chunk_size': 7})
+        self.assertTrue(file.mimetype == 'text/plain')
+        self.assertEquals(file.file.read().decode('utf-8'), content)
+
     def test_date_datetuple_conversion(self):
         type = schemaish.Date()
         value = date(1966,12,18)
@@ -114,6 +163,9 @@ class TestConverters(unittest.TestCase):
         value, expected = expected, value
         actual = string_converter(type).to_type(value)
         self.assertEquals(actual,expected)
+        # csv only takes single character delimiters.
+        self.assertRaises(csv.Error, string_converter(type).to_type, '1;;2',
+                          {'delimiter': ';;'})
 
     def test_sequenceboolean_string_conversion(self):
         type = schemaish.Sequence(schemaish.Boolean())
@@ -167,6 +219,33 @@ class TestConverters(unittest.TestCase):
         self.assertEquals(converter.to_type(',foo'), (None, 'foo'))
         self.assertEquals(converter.to_type('1,'), (1, None))
 
+    def test_tuple_many(self):
+        schema = schemaish.Tuple([schemaish.Integer(), schemaish.String()])
+        converter = string_converter(schema)
+        values = [(1, u'a,b'), None, (2, u'c\nd'), (None, u'e')]
+        strings = converter.from_type_many(values)
+        self.assertEquals(strings, [u'1,"a,b"', None, u'2,"c\nd"', u',e'])
+        self.assertEquals(converter.to_type_many(strings), values)
+        self.assertEquals(converter.to_type_many([u'1;x,y'], {'delimiter': ';'}),
+                          [(1, u'x,y')])
+        try:
+            converter.to_type_many(['1,a', '2', '3,c'])
+        except ConvertError, e:
+            self.assertEquals(e.index, 1)
+            self.assertEquals(e.message, 'Too few arguments')
+        else:
+            self.fail('ConvertError not raised')
+        self.assertRaises(ConvertError, converter.to_type, '')
+        self.assertEquals(converter.to_type('1,a'), (1, u'a'))
+
+    def test_tuple_attrs_changed(self):
+        schema = schemaish.Tuple([schemaish.Integer()])
+        converter = string_converter(schema)
+        self.assertEquals(converter.to_type('1'), (1,))
+        schema.attrs.append(schemaish.Integer())
+        self.assertEquals(converter.to_type('1,2'), (1, 2))
+        self.assertEquals(converter.from_type((1, 2)), '1,2')
+
     def test_time_string_conversion(self):
         schema = schemaish.Time()
         converter = string_converter(schema)
@@ -195,6 +274,131 @@ class TestConverters(unittest.TestCase):
         for t, s in tests:
             self.assertEquals(converter.from_type(t), s)
             self.assertEquals(converter.to_type(s), t)
+            self.assertEquals(converter.to_type(' %s ' % s), t)
+            self.assertEquals(converter.to_type_many([' %s ' % s]), [t])
+        self.assertEquals(converter.from_type(None), None)
+        self.assertEquals(converter.to_type(None), None)
+
+    def test_many_conversion(self):
+        tz = SimpleTZInfo(90)
+        tests = [
+            (schemaish.Integer(), [1, None, 3], ['1', None, '3']),
+            (schemaish.Float(), [1.5, 2.0], ['1.5', '2.0']),
+            (schemaish.Decimal(), [Decimal('1.10')], ['1.10']),
+            (schemaish.Boolean(), [True, False, None], ['True', 'False', None]),
+            (schemaish.String(), [u'a', u'b'], [u'a', u'b']),
+            (schemaish.Date(), [date(1966, 12, 18)], ['1966-12-18']),
+            (schemaish.Time(), [time(1, 2, 3, 0, tz)], ['01:02:03+01:30']),
+            (schemaish.DateTime(), [datetime(2001, 2, 3, 4, 5, 6), None],
+             ['2001-02-03T04:05:06', None]),
+        ]
+        for type, values, strings in tests:
+            converter = string_converter(type)
+            self.assertEquals(converter.from_type_many(values), strings)
+            self.assertEquals(converter.to_type_many(iter(strings)), values)
+
+    def test_many_error_index(self):
+        for type, values in [(schemaish.Integer(), ['1', ' 2 ', 'x']),
+                             (schemaish.Boolean(), ['True', 'False', 'x']),
+                             (schemaish.Date(), ['2001-01-01', None, 'x'])]:
+            try:
+                string_converter(type).to_type_many(values)
+            except ConvertError, e:
+                self.assertEquals(e.index, 2)
+            else:
+                self.fail('ConvertError not raised')
+        try:
+            string_converter(schemaish.Time()).to_type_many(['01:02', 'x'])
+        except ConvertError, e:
+            self.assertEquals((e.index, e.message), (1, 'Invalid time'))
+        else:
+            self.fail('ConvertError not raised')
+
+    def test_batch(self):
+        for type, strings, values, errors in [
+                (schemaish.Integer(), ['1', 'x', None, ' 4 ', 'y'],
+                 [1, None, None, 4, None],
+                 [(1, 'Not a valid integer'), (4, 'Not a valid integer')]),
+                (schemaish.Decimal(), ['1.5', 'x'], [Decimal('1.5'), None],
+                 [(1, 'Not a valid number')]),
+                (schemaish.Boolean(), ['True', 'x'], [True, None],
+                 [(1, "'x' should be either True or False")]),
+                (schemaish.Date(), ['x', '1966-12-18'],
+                 [None, date(1966, 12, 18)], [(0, 'Invalid date')]),
+                (schemaish.String(), [u'a'], [u'a'], []),
+                (schemaish.Sequence(schemaish.Integer()), ['1,2', None, 'x'],
+                 [[1, 2], None, None], [(2, 'Not a valid integer')]),
+                ]:
+            result = string_converter(type).to_type_batch(strings)
+            self.assertEquals(result.values, values)
+            self.assertEquals(result.errors, errors)
+            self.assertEquals(result.ok, not errors)
+        for type, string, values, errors in [
+                (schemaish.Sequence(schemaish.Integer()), '1,x,3',
+                 [1, None, 3], [(1, 'Not a valid integer')]),
+                (schemaish.Sequence(schemaish.Sequence(schemaish.Integer())),
+                 '1,2\nx,4\n5', [[1, 2], None, [5]],
+                 [(1, 'Not a valid integer')]),
+                ]:
+            result = string_converter(type).to_type_batch_csv(string)
+            self.assertEquals(result.values, values)
+            self.assertEquals(result.errors, errors)
+        self.assertEquals(string_converter(schemaish.Sequence(
+            schemaish.Integer())).to_type_batch_csv(None), None)
+        result = string_converter(schemaish.Integer()).to_type_batch(['1'])
+        self.assertEquals(result.check(), [1])
+        result = string_converter(schemaish.Integer()).to_type_batch(['1', 'x'])
+        try:
+            result.check()
+        except ConvertError, e:
+            self.assertEquals(e.index, 1)
+        else:
+            self.fail('ConvertError not raised')
+
+    def test_sequence_iter_to_type(self):
+        type = schemaish.Sequence(schemaish.Sequence(schemaish.Integer()))
+        rows = string_converter(type).iter_to_type(StringIO('1,2\n\n3,4\n'))
+        self.assertEquals(rows.next(), [1, 2])
+        self.assertEquals(list(rows), [[3, 4]])
+
+        type = schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                                   schemaish.String())))
+        rows = string_converter(type).iter_to_type([u'1,"a\n', u'b"\n',
+                                                    u'2,\xa3\n'])
+        self.assertEquals(list(rows), [(1, u'a\nb'), (2, u'\xa3')])
+
+        type = schemaish.Sequence(schemaish.Integer())
+        converter = string_converter(type)
+        self.assertEquals(list(converter.iter_to_type(['1,2,3'])), [1, 2, 3])
+        self.assertEquals(list(converter.iter_to_type(['1\n', '2\r\n'],
+                                        converter_options={'delimiter': '\n'})),
+                          [1, 2])
+        self.assertRaises(ConvertError, list,
+                          converter.iter_to_type(['1,2\n', '3\n']))
+
+    def test_sequence_quoted_newline(self):
+        type = schemaish.Sequence(schemaish.Sequence(schemaish.String()))
+        converter = string_converter(type)
+        value = [[u'a\nb', u'c'], [u'd', u'e']]
+        self.assertEquals(converter.to_type(converter.from_type(value)), value)
+
+    def test_sequence_write_to(self):
+        type = schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                                   schemaish.String())))
+        converter = string_converter(type)
+        value = [(1, u'a,b'), (2, u'\xa3')]
+        self.assertEquals(list(converter.iter_from_type(value)),
+                          [u'1,"a,b"', u'2,\xa3'])
+        out = StringIO()
+        converter.write_to(value, out)
+        self.assertEquals(out.getvalue(), '1,"a,b"\n2,\xc2\xa3\n')
+        out.seek(0)
+        self.assertEquals(list(converter.iter_to_type(out)), value)
+
+        converter = string_converter(schemaish.Sequence(schemaish.Integer()))
+        out = StringIO()
+        converter.write_to([1, 2, 3], out, converter_options={'delimiter': ';'})
+        self.assertEquals(out.getvalue(), '1;2;3\n')
 
 
 if __name__ == '__main__':
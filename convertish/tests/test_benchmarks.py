@@ -0,0 +1,40 @@
+import unittest
+
+from convertish.benchmarks import Benchmark, run, compare
+from convertish.benchmarks import bench_import
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_run(self):
+        results = run([Benchmark('list', list, 'abc'),
+                       Benchmark('str', str, 1)], duration=0.001)
+        self.assertEquals(sorted(results['results']), ['list', 'str'])
+        self.assertTrue(results['results']['str']['ops_per_sec'] > 0)
+        self.assertEquals(results['results']['list']['objects_per_op'], 1)
+        self.assertEquals(results['results']['str']['objects_per_op'], 0)
+
+    def test_compare(self):
+        baseline = {'results': {
+            'a': {'ops_per_sec': 100, 'objects_per_op': 1},
+            'b': {'ops_per_sec': 100, 'objects_per_op': 1},
+            'c': {'ops_per_sec': 100, 'objects_per_op': 1}}}
+        results = {'results': {
+            'a': {'ops_per_sec': 95, 'objects_per_op': 1},
+            'b': {'ops_per_sec': 80, 'objects_per_op': 1},
+            'c': {'ops_per_sec': 200, 'objects_per_op': 3},
+            'd': {'ops_per_sec': 1, 'objects_per_op': 100}}}
+        regressions = compare(results, baseline, threshold=0.1)
+        self.assertEquals([name for name, message in regressions], ['b', 'c'])
+
+
+    def test_lazy_imports(self):
+        elapsed, loaded = bench_import.measure('convertish.convert', runs=1)
+        self.assertTrue(elapsed > 0)
+        self.assertTrue('convertish.convert' in loaded)
+        for name in bench_import.LAZY:
+            self.assertFalse(name in loaded, name)
+
+
+if __name__ == '__main__':
+    unittest.main()
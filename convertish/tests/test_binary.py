@@ -0,0 +1,147 @@
+# -*- coding: utf-8
+import unittest
+from cStringIO import StringIO
+from datetime import date, datetime, time
+from decimal import Decimal
+import schemaish
+import schemaish.type
+
+from convertish.convert import binary_converter, ConvertError
+from convertish.util import SimpleTZInfo
+
+
+class TestBinary(unittest.TestCase):
+
+    def assertRoundTrip(self, schema, value):
+        converter = binary_converter(schema)
+        encoded = converter.from_type(value)
+        self.assertTrue(isinstance(encoded, str))
+        for buf in (encoded, bytearray(encoded), memoryview(encoded),
+                    buffer(encoded)):
+            self.assertEquals(converter.to_type(buf), value)
+        return encoded
+
+    def test_simple(self):
+        tz = SimpleTZInfo(-90)
+        for schema, values in [
+                (schemaish.String(), [u'', u'hello', u'£,\n']),
+                (schemaish.Integer(), [0, -1, 2**63 - 1, -2**63, 2**70,
+                                       -2**70]),
+                (schemaish.Float(), [0.0, -1.5, 1e300]),
+                (schemaish.Decimal(), [Decimal('1.10'), Decimal('-1E+5')]),
+                (schemaish.Boolean(), [True, False]),
+                (schemaish.Date(), [date(2009, 5, 1), date(1, 1, 1)]),
+                (schemaish.Time(), [time(12, 30, 15, 250000),
+                                    time(0, 0, 0, 0, tz)]),
+                (schemaish.DateTime(), [datetime(2009, 5, 1, 12, 30, 15, 1),
+                                        datetime(2009, 5, 1, 0, 0, 0, 0, tz)]),
+                ]:
+            for value in values:
+                self.assertRoundTrip(schema, value)
+            converter = binary_converter(schema)
+            self.assertEquals(converter.from_type(None), None)
+            self.assertEquals(converter.to_type(None), None)
+            self.assertEquals(converter.to_type('\x00'), None)
+
+    def test_compact(self):
+        self.assertEquals(len(self.assertRoundTrip(schemaish.Integer(), 1)),
+                          9)
+        self.assertEquals(len(self.assertRoundTrip(schemaish.Date(),
+                                                   date(2009, 5, 1))), 5)
+        self.assertEquals(len(self.assertRoundTrip(schemaish.Boolean(),
+                                                   True)), 1)
+
+    def test_timezone(self):
+        converter = binary_converter(schemaish.DateTime())
+        value = converter.to_type(converter.from_type(
+            datetime(2009, 5, 1, 12, 0, 0, 0, SimpleTZInfo(330))))
+        self.assertTrue(value.tzinfo is SimpleTZInfo(330))
+
+    def test_sequence(self):
+        schema = schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                                     schemaish.String(),
+                                                     schemaish.Date())))
+        self.assertRoundTrip(schema, [])
+        self.assertRoundTrip(schema, [(1, u'a,b', date(2009, 5, 1)),
+                                      (None, None, None)])
+        self.assertRoundTrip(schemaish.Sequence(schemaish.Sequence(
+            schemaish.Float())), [[1.5, None], []])
+
+    def test_packed_sequence(self):
+        schema = schemaish.Sequence(schemaish.Integer())
+        packed = self.assertRoundTrip(schema, range(-5, 5))
+        self.assertEquals(len(packed), 5 + 10 * 8)
+        self.assertRoundTrip(schema, [1, None, 2])
+        self.assertRoundTrip(schema, [1, 2**64])
+        self.assertRoundTrip(schemaish.Sequence(schemaish.Float()),
+                             [1.5, -2.0])
+        converter = binary_converter(schema)
+        self.assertRaises(ConvertError, converter.to_type, packed[:-1])
+        self.assertRaises(ValueError, converter.from_type, [1, 1.7])
+        self.assertRaises(ValueError, converter.from_type, [1, '12'])
+        self.assertRaises(ValueError, binary_converter(schemaish.Integer())
+                          .from_type, 1.7)
+        self.assertRoundTrip(schema, [True, 2L])
+
+    def test_tuple_arity(self):
+        converter = binary_converter(schemaish.Tuple((schemaish.Integer(),
+                                                      schemaish.Integer())))
+        encoded = binary_converter(schemaish.Tuple((
+            schemaish.Integer(),))).from_type((1,))
+        self.assertRaises(ConvertError, converter.to_type, encoded)
+        self.assertRaises(ValueError, converter.from_type, (1,))
+
+    def test_tuple_attrs_changed(self):
+        schema = schemaish.Tuple([schemaish.Integer()])
+        converter = binary_converter(schema)
+        self.assertRoundTrip(schema, (1,))
+        schema.attrs.append(schemaish.String())
+        self.assertRoundTrip(schema, (1, u'a'))
+
+    def test_file(self):
+        converter = binary_converter(schemaish.File())
+        encoded = converter.from_type(schemaish.type.File(
+            StringIO('data'), u'é.txt', 'text/plain'))
+        for buf in (encoded, memoryview(encoded)):
+            value = converter.to_type(buf)
+            self.assertEquals(value.file.read(), 'data')
+            self.assertEquals(value.filename, u'é.txt')
+            self.assertEquals(value.mimetype, 'text/plain')
+        value = converter.to_type(converter.from_type(
+            schemaish.type.File(None, None, None)))
+        self.assertEquals((value.file, value.filename, value.mimetype),
+                          (None, None, None))
+
+    def test_slice_of_buffer(self):
+        converter = binary_converter(schemaish.Integer())
+        encoded = 'xx' + converter.from_type(42)
+        self.assertEquals(converter.to_type(memoryview(encoded)[2:]), 42)
+        self.assertEquals(converter.unpack(encoded, 2), (42, len(encoded)))
+
+    def test_invalid(self):
+        converter = binary_converter(schemaish.String())
+        encoded = converter.from_type(u'hello')
+        self.assertRaises(ConvertError, converter.to_type, encoded[:-1])
+        self.assertRaises(ConvertError, converter.to_type, encoded[:3])
+        self.assertRaises(ConvertError, converter.to_type, encoded + 'x')
+        self.assertRaises(ConvertError, converter.to_type, '\x07')
+        self.assertRaises(ConvertError, converter.to_type, '')
+        self.assertRaises(ConvertError, converter.to_type,
+                          '\x01\x01\x00\x00\x00\xff')
+        self.assertRaises(ConvertError,
+                          binary_converter(schemaish.Date()).to_type,
+                          '\x01\x00\x00\x01\x01')
+        self.assertRaises(ConvertError,
+                          binary_converter(schemaish.Decimal()).to_type,
+                          '\x01\x01\x00\x00\x00x')
+        try:
+            binary_converter(schemaish.Sequence(schemaish.String())).to_type_many(
+                [None, '\x01\x01\x00\x00\x00\x07'])
+        except ConvertError, e:
+            self.assertEquals(e.index, 1)
+        else:
+            self.fail('ConvertError not raised')
+
+
+if __name__ == '__main__':
+    unittest.main()
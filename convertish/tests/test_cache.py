@@ -0,0 +1,221 @@
+import copy
+import pickle
+import unittest
+from datetime import date
+import schemaish
+
+from convertish import convert
+from convertish.convert import string_converter, json_converter, \
+        converter_cache_info, register, ConverterFamily, NullConverter, \
+        FloatToStringConverter, IntegerToStringConverter, \
+        DateToStringConverter, TupleToListConverter
+
+
+class MyDate(DateToStringConverter):
+
+    def __init__(self, schema_type, fmt=None):
+        DateToStringConverter.__init__(self, schema_type)
+        self.fmt = fmt
+
+
+def make_family():
+    """
+    A throwaway family to register on, so the global ones are left alone.
+    """
+    @ConverterFamily
+    def test_converter(schema_type):
+        pass
+    test_converter.when_type(schemaish.String)(NullConverter)
+    test_converter.when_type(schemaish.Integer)(IntegerToStringConverter)
+    return test_converter
+
+
+class TestConverterCache(unittest.TestCase):
+
+    def tearDown(self):
+        convert._families.pop('test_converter', None)
+
+    def test_same_converter_returned(self):
+        type = schemaish.Sequence(schemaish.Integer())
+        self.assertTrue(string_converter(type) is string_converter(type))
+        self.assertTrue(string_converter(type) is not
+                        string_converter(schemaish.Sequence(schemaish.Integer())))
+
+    def test_leaf_converters_shared(self):
+        converter = string_converter(schemaish.Integer())
+        self.assertTrue(converter is string_converter(schemaish.Integer()))
+        self.assertTrue(converter is
+                        IntegerToStringConverter(schemaish.Integer()))
+        self.assertTrue(converter.schema_class is schemaish.Integer)
+        self.assertTrue(converter.schema_type is None)
+        self.assertFalse(hasattr(converter, '__dict__'))
+        self.assertTrue(pickle.loads(pickle.dumps(converter, 2)) is converter)
+        self.assertTrue(json_converter(schemaish.String()) is
+                        json_converter(schemaish.String()))
+        self.assertTrue(json_converter(schemaish.String()) is not
+                        json_converter(schemaish.Integer()))
+
+    def test_leaf_subclasses_not_shared(self):
+        schema = schemaish.Date()
+        a, b = MyDate(schema, fmt='a'), MyDate(schema, fmt='b')
+        self.assertTrue(a is not b)
+        self.assertEquals((a.fmt, b.fmt), ('a', 'b'))
+        self.assertTrue(a.schema_type is schema)
+        self.assertTrue(a.converter_options is not b.converter_options)
+        copied = pickle.loads(pickle.dumps(a, 2))
+        self.assertEquals((copied.fmt, copied.schema_class),
+                          ('a', schemaish.Date))
+        options = DateToStringConverter(schema, converter_options={'x': 1})
+        self.assertTrue(options is not string_converter(schema))
+        self.assertEquals(options.converter_options, {'x': 1})
+
+    def test_leaf_init_not_rerun(self):
+        class Counting(DateToStringConverter):
+            __slots__ = ('count',)
+            def __init__(self, schema_type):
+                self.count = getattr(self, 'count', 0) + 1
+        a, b = Counting(schemaish.Date()), Counting(schemaish.Date())
+        self.assertTrue(a is not b)
+        self.assertEquals((a.count, b.count), (1, 1))
+        self.assertTrue(a.schema_type is not None)
+
+    def test_tuple_to_list_shared(self):
+        converter = json_converter(schemaish.Tuple((schemaish.Integer(),)))
+        self.assertTrue(isinstance(converter, TupleToListConverter))
+        self.assertTrue(converter is json_converter(schemaish.Tuple(())))
+        self.assertEquals(converter.to_type([1, 2]), (1, 2))
+
+    def test_pickle_converters(self):
+        for schema in [schemaish.Sequence(schemaish.Integer()),
+                       schemaish.Tuple((schemaish.Integer(),))]:
+            for protocol in (0, 2):
+                converter = pickle.loads(pickle.dumps(
+                    string_converter(schema), protocol))
+                self.assertEquals(type(converter),
+                                  type(string_converter(schema)))
+                self.assertEquals(converter.to_type('1'), string_converter(
+                    schema).to_type('1'))
+
+    def test_copied_schema(self):
+        original = schemaish.Sequence(schemaish.Integer())
+        converter = string_converter(original)
+        for copied in (copy.copy(original), copy.deepcopy(original)):
+            copied.attr = schemaish.Date()
+            self.assertTrue(string_converter(copied).schema_type is copied)
+            self.assertEquals(string_converter(copied).to_type('2009-01-01'),
+                              [date(2009, 1, 1)])
+            self.assertTrue(string_converter(original) is converter)
+
+    def test_families_cached_separately(self):
+        type = schemaish.Integer()
+        self.assertTrue(string_converter(type) is not json_converter(type))
+        self.assertTrue(isinstance(json_converter(type), NullConverter))
+
+    def test_hits_and_misses(self):
+        type = schemaish.Float()
+        before = string_converter.cache_info()
+        string_converter(type)
+        string_converter(type)
+        string_converter(type)
+        after = string_converter.cache_info()
+        self.assertEquals(after['misses'] - before['misses'], 1)
+        self.assertEquals(after['hits'] - before['hits'], 2)
+        self.assertEquals(converter_cache_info()['string_converter'], after)
+
+    def test_compiled_not_counted(self):
+        schema = schemaish.Tuple([schemaish.Integer()])
+        converter = string_converter(schema)
+        converter.to_type('1')
+        before = string_converter.cache_info()
+        converter.to_type('2')
+        converter.from_type((2,))
+        self.assertEquals(string_converter.cache_info(), before)
+
+    def test_old_versions_replaced(self):
+        schema = schemaish.Tuple([schemaish.Integer()])
+        converter = string_converter(schema)
+        converter.to_type('1')
+        schema.attrs.append(schemaish.String())
+        self.assertEquals(converter.to_type('1,a'), (1, u'a'))
+        self.assertEquals(sorted(schema._convertish_cache),
+                          ['string_converter', 'tuple_codec'])
+
+    def test_registration_invalidates(self):
+        class Special(schemaish.String):
+            pass
+        family = make_family()
+        type = Special()
+        first = family(type)
+        @family.when_type(Special)
+        def special_to_string(schema_type):
+            return 'special'
+        self.assertEquals(family(type), 'special')
+        self.assertTrue(first is not family(type))
+
+    def test_sequence_reuses_item_converter(self):
+        type = schemaish.Sequence(schemaish.Integer())
+        converter = string_converter(type)
+        converter.to_type('1,2,3')
+        before = string_converter.cache_info()
+        self.assertEquals(converter.to_type(','.join(['1'] * 100)), [1] * 100)
+        after = string_converter.cache_info()
+        self.assertEquals(after['misses'], before['misses'])
+        self.assertEquals(after['hits'] - before['hits'], 1)
+
+
+class TestDispatch(unittest.TestCase):
+
+    def tearDown(self):
+        convert._families.pop('test_converter', None)
+
+    def test_subclass_uses_base_registration(self):
+        class Special(schemaish.Integer):
+            pass
+        converter = string_converter(Special())
+        self.assertTrue(isinstance(converter, IntegerToStringConverter))
+        self.assertEquals(converter.to_type('12'), 12)
+
+    def test_unregistered_uses_default(self):
+        class Unknown(schemaish.attr.Attribute):
+            pass
+        self.assertTrue(string_converter(Unknown()) is None)
+        self.assertTrue(json_converter(Unknown()) is None)
+
+    def test_when_object(self):
+        family = make_family()
+        special = schemaish.Integer()
+        @family.when_object(special)
+        def special_to_string(schema_type):
+            return 'special'
+        self.assertEquals(family(special), 'special')
+        self.assertTrue(family.has_object(special))
+        self.assertTrue(isinstance(family(schemaish.Integer()),
+                                   IntegerToStringConverter))
+
+    def test_duplicate_when_type(self):
+        class Special(schemaish.String):
+            pass
+        family = make_family()
+        family.when_type(Special)(FloatToStringConverter)
+        self.assertTrue(family.has_type(Special))
+        self.assertRaises(TypeError, family.when_type(Special),
+                          IntegerToStringConverter)
+        self.assertRaises(TypeError, family.when_type, 'Special')
+
+    def test_register_replaces(self):
+        class Special(schemaish.String):
+            pass
+        class SpecialChild(Special):
+            pass
+        family = make_family()
+        child = SpecialChild()
+        register('test', Special, FloatToStringConverter)
+        self.assertTrue(isinstance(family(child), FloatToStringConverter))
+        register(family, Special, IntegerToStringConverter)
+        self.assertTrue(isinstance(family(child), IntegerToStringConverter))
+        self.assertRaises(ValueError, register, 'nonesuch', Special,
+                          FloatToStringConverter)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import schemaish
+
+from convertish import instrument
+from convertish.convert import string_converter, ConvertError, \
+        NumberToStringConverter
+
+
+class TestInstrument(unittest.TestCase):
+
+    def setUp(self):
+        instrument.reset()
+
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_disabled(self):
+        original = NumberToStringConverter.__dict__['to_type']
+        string_converter(schemaish.Integer()).to_type('1')
+        self.assertEquals(instrument.snapshot(), {})
+        instrument.enable()
+        self.assertTrue(instrument.enabled())
+        self.assertTrue(NumberToStringConverter.__dict__['to_type'] is not
+                        original)
+        instrument.enable()
+        instrument.disable()
+        self.assertFalse(instrument.enabled())
+        self.assertTrue(NumberToStringConverter.__dict__['to_type'] is
+                        original)
+
+    def test_disable_recompiles(self):
+        from convertish.jsoncodec import dumps
+        from datetime import date
+        from decimal import Decimal
+        tuple_type = schemaish.Tuple((schemaish.Integer(), schemaish.Date()))
+        structure = schemaish.Structure()
+        structure.add('count', schemaish.Integer())
+        structure.add('amount', schemaish.Decimal())
+        instrument.enable()
+        string_converter(tuple_type).to_type('1,2009-01-01')
+        dumps(structure, {'count': 1, 'amount': Decimal('1.5')})
+        instrument.disable()
+        instrument.reset()
+        self.assertEquals(string_converter(tuple_type).to_type('1,2009-01-01'),
+                          (1, date(2009, 1, 1)))
+        dumps(structure, {'count': 1, 'amount': Decimal('1.5')})
+        self.assertEquals(instrument.snapshot(), {})
+
+    def test_stats(self):
+        instrument.enable()
+        type = schemaish.Integer()
+        converter = string_converter(type)
+        for n in range(10):
+            converter.to_type('12')
+        converter.from_type(123)
+        self.assertRaises(ConvertError, converter.to_type, 'x')
+        converter.to_type_many(['1', '2'])
+        stats = instrument.snapshot()
+
+        to_type = stats['IntegerToStringConverter.to_type[Integer]']
+        self.assertEquals(to_type['calls'], 11)
+        self.assertEquals(to_type['errors'], 1)
+        self.assertEquals(to_type['convert_errors'], 1)
+        self.assertEquals(to_type['bytes_in'], 21)
+        self.assertTrue(to_type['p50'] <= to_type['p99'])
+        self.assertTrue(to_type['total_time'] > 0)
+        from_type = stats['IntegerToStringConverter.from_type[Integer]']
+        self.assertEquals(from_type['bytes_out'], 3)
+        many = stats['IntegerToStringConverter.to_type_many[Integer]']
+        self.assertEquals((many['calls'], many['bytes_in']), (1, 2))
+        self.assertEquals(stats['string_converter[Integer]']['calls'], 1)
+
+        instrument.reset()
+        self.assertEquals(instrument.snapshot(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
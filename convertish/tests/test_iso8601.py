@@ -0,0 +1,60 @@
+import unittest
+from datetime import date, datetime, time
+
+from convertish import iso8601
+from convertish.util import SimpleTZInfo
+
+
+class TestISO8601(unittest.TestCase):
+
+    def test_parse_date(self):
+        self.assertEquals(iso8601.parse_date('1966-12-18'), date(1966, 12, 18))
+        self.assertEquals(iso8601.parse_date('1966-1-8'), date(1966, 1, 8))
+        for value in ['nonsense', '1990-1-1andabit', '1966-12-1x', '',
+                      '-966-12-18', '1966-13-18']:
+            self.assertRaises(ValueError, iso8601.parse_date, value)
+
+    def test_parse_time(self):
+        tz = SimpleTZInfo(90)
+        tests = [('01:02:03', time(1, 2, 3)),
+                 ('01:02', time(1, 2)),
+                 ('1:2:3', time(1, 2, 3)),
+                 ('01:02:03.000004', time(1, 2, 3, 4)),
+                 ('01:02:03.5', time(1, 2, 3, 500000)),
+                 ('01:02:03.1234567', time(1, 2, 3, 123456)),
+                 ('01:02:03+01:30', time(1, 2, 3, 0, tz)),
+                 ('01:02:03+0130', time(1, 2, 3, 0, tz)),
+                 ('01:02:03.000004+01:30', time(1, 2, 3, 4, tz)),
+                 ('01:02:03.000004-01:30',
+                  time(1, 2, 3, 4, SimpleTZInfo(-90))),
+                 ('01:02:03.25-01:30', time(1, 2, 3, 250000, SimpleTZInfo(-90))),
+                 ('01:02:03Z', time(1, 2, 3, 0, SimpleTZInfo(0)))]
+        for value, expected in tests:
+            actual = iso8601.parse_time(value)
+            self.assertEquals(actual, expected)
+            self.assertEquals(actual.utcoffset(), expected.utcoffset())
+        for value in ['nonsense', '25:00:00', '01:02:03+', '01:-2:03',
+                      '01:02:03.', '01:02:03+01:3x']:
+            self.assertRaises(ValueError, iso8601.parse_time, value)
+
+    def test_parse_datetime(self):
+        self.assertEquals(iso8601.parse_datetime('2001-02-03T04:05:06.000007Z'),
+                          datetime(2001, 2, 3, 4, 5, 6, 7, SimpleTZInfo(0)))
+        self.assertEquals(iso8601.parse_datetime('2001-2-3T4:05'),
+                          datetime(2001, 2, 3, 4, 5))
+        self.assertRaises(ValueError, iso8601.parse_datetime, '2001-02-03')
+
+    def test_parse_many(self):
+        self.assertEquals(iso8601.parse_many(iso8601.parse_date,
+                                             ['2001-02-03', None]),
+                          [date(2001, 2, 3), None])
+        try:
+            iso8601.parse_many(iso8601.parse_time, ['01:02', 'x'])
+        except ValueError, e:
+            self.assertEquals(e.index, 1)
+        else:
+            self.fail('ValueError not raised')
+
+
+if __name__ == '__main__':
+    unittest.main()
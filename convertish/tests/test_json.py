@@ -1,6 +1,7 @@
 import unittest
 import schemaish
 from datetime import date, time
+from decimal import Decimal
 from convertish.convert import json_converter,  ConvertError
 
 
@@ -65,6 +66,34 @@ class TestJSONConverters(unittest.TestCase):
         actual = json_converter(type).to_type(value)
         self.assertEquals(actual,expected)
 
+    def test_decimal_json_conversion(self):
+        converter = json_converter(schemaish.Decimal())
+        self.assertEquals(converter.from_type(Decimal('1.10')), '1.10')
+        self.assertEquals(converter.to_type('1.10'), Decimal('1.10'))
+        self.assertEquals(converter.to_type(0.1), Decimal('0.1'))
+        self.assertEquals(converter.to_type(3), Decimal('3'))
+        self.assertRaises(ConvertError, converter.to_type, 'x')
+
+        options = {'json_format': 'scaled', 'quantize': -2}
+        self.assertEquals(converter.from_type(Decimal('1.25'), options), 125)
+        self.assertEquals(converter.from_type(Decimal('1.255'), options), 126)
+        self.assertEquals(converter.to_type(125, options), Decimal('1.25'))
+        self.assertEquals(converter.to_type('1.25', options), Decimal('1.25'))
+        self.assertRaises(ValueError, converter.from_type, Decimal('1'),
+                          {'json_format': 'scaled'})
+        self.assertRaises(ConvertError, converter.to_type, {}, options)
+        self.assertRaises(ConvertError, converter.to_type, [1], options)
+
+        options = {'precision': 3}
+        self.assertEquals(converter.from_type(Decimal('1.2345'), options),
+                          '1.23')
+        self.assertEquals(converter.to_type('1.2345', options),
+                          Decimal('1.23'))
+        self.assertEquals(converter.to_type(12345, options),
+                          Decimal('1.23E+4'))
+        options = {'precision': 3, 'quantize': -1, 'json_format': 'scaled'}
+        self.assertEquals(converter.from_type(Decimal('1.2345'), options), 12)
+
     def test_boolean_json_conversion(self):
         type = schemaish.Boolean()
         value = True
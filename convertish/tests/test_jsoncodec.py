@@ -0,0 +1,185 @@
+import json
+import unittest
+import schemaish
+import schemaish.type
+from cStringIO import StringIO
+from datetime import date, time
+from decimal import Decimal
+
+from convertish.convert import json_converter, NullConverter
+from convertish.jsoncodec import dumps, dump, iterload
+
+
+class Event(schemaish.Structure):
+    title = schemaish.String()
+    day = schemaish.Date()
+    at = schemaish.Time()
+    count = schemaish.Integer()
+    ratio = schemaish.Float()
+    public = schemaish.Boolean()
+    pair = schemaish.Tuple((schemaish.Integer(), schemaish.String()))
+    tags = schemaish.Sequence(schemaish.String())
+    notes = schemaish.File()
+
+
+class TestJSONEncoder(unittest.TestCase):
+
+    def test_leaves_match_json_converter(self):
+        tests = [
+            (schemaish.String(), u'\xa3"x"'),
+            (schemaish.Integer(), 10L),
+            (schemaish.Float(), 1.28),
+            (schemaish.Decimal(), Decimal('1.10')),
+            (schemaish.Boolean(), False),
+            (schemaish.Date(), date(1966, 12, 18)),
+            (schemaish.Time(), time(11, 12, 30, 500000)),
+            (schemaish.Tuple((schemaish.Integer(), schemaish.String())),
+             (1, u'1')),
+            (schemaish.Sequence(schemaish.Integer()), [1, 2, 3]),
+            (schemaish.Sequence(schemaish.Integer()), []),
+            (schemaish.Integer(), None),
+        ]
+        for type, value in tests:
+            expected = json.loads(json.dumps(json_converter(type).from_type(value)))
+            self.assertEquals(json.loads(dumps(type, value)), expected)
+
+    def test_structure(self):
+        value = {'title': u'Launch', 'day': date(2009, 5, 1),
+                 'at': time(9, 30), 'count': 3, 'ratio': 0.5, 'public': True,
+                 'pair': (1, u'a'), 'tags': [u'x', u'y'],
+                 'notes': schemaish.type.File(StringIO('hello'), None, None)}
+        actual = json.loads(dumps(Event(), value))
+        self.assertEquals(actual['day'], {'__type__': 'date', 'year': 2009,
+                                          'month': 5, 'day': 1})
+        self.assertEquals(actual['at']['minute'], 30)
+        self.assertEquals(actual['pair'], [1, u'a'])
+        self.assertEquals(actual['tags'], [u'x', u'y'])
+        self.assertEquals(actual['notes'], u'hello')
+        self.assertEquals(actual['public'], True)
+        self.assertEquals(json.loads(dumps(Event(), {}))['title'], None)
+
+    def test_sequence_of_dates(self):
+        type = schemaish.Sequence(schemaish.Date())
+        self.assertEquals(dumps(type, [date(2009, 5, 1)]),
+            '[{"__type__": "date", "year": 2009, "month": 5, "day": 1}]')
+
+    def test_schema_changed(self):
+        inner = schemaish.Structure()
+        inner.add('a', schemaish.Integer())
+        outer = schemaish.Sequence(inner)
+        self.assertEquals(dumps(inner, {'a': 1, 'b': 2}), '{"a": 1}')
+        self.assertEquals(dumps(outer, [{'a': 1, 'b': 2}]), '[{"a": 1}]')
+        inner.add('b', schemaish.Integer())
+        self.assertEquals(dumps(inner, {'a': 1, 'b': 2}), '{"a": 1, "b": 2}')
+        self.assertEquals(dumps(outer, [{'a': 1, 'b': 2}]),
+                          '[{"a": 1, "b": 2}]')
+        outer.attr = schemaish.Date()
+        self.assertEquals(json.loads(dumps(outer, [date(2009, 5, 1)]))[0]['day'],
+                          1)
+        pair = schemaish.Tuple([schemaish.Integer()])
+        self.assertEquals(dumps(pair, (1,)), '[1]')
+        pair.attrs.append(schemaish.String())
+        self.assertEquals(dumps(pair, (1, u'a')), '[1, "a"]')
+
+    def test_dump(self):
+        out = StringIO()
+        dump(schemaish.Sequence(schemaish.Float()), [1.5, 2.0], out)
+        self.assertEquals(out.getvalue(), '[1.5, 2.0]')
+
+    def test_registered_converter_used(self):
+        class Upper(schemaish.String):
+            pass
+        class UpperConverter(NullConverter):
+            def from_type(self, value, converter_options={}):
+                return value.upper()
+        @json_converter.when_type(Upper)
+        def upper_to_json(schema_type):
+            return UpperConverter(schema_type)
+        try:
+            self.assertEquals(dumps(schemaish.Sequence(Upper()), [u'a']),
+                              '["A"]')
+        finally:
+            # dumps only uses the global json_converter, so undo it.
+            del json_converter._by_type[Upper]
+            json_converter.cache_clear()
+
+
+
+class TestJSONDecoder(unittest.TestCase):
+
+    def test_iterload(self):
+        type = schemaish.Sequence(schemaish.Date())
+        days = [date(2009, 5, n) for n in range(1, 30)]
+        data = dumps(type, days)
+        for chunk_size in (1, 7, 1000):
+            items = iterload(type, StringIO(data), chunk_size=chunk_size)
+            self.assertEquals(items.next(), days[0])
+            self.assertEquals(list(items), days[1:])
+
+    def test_iterload_scalars(self):
+        type = schemaish.Sequence(schemaish.Integer())
+        data = ' [ 123 ,4,\n56789 ] '
+        for chunk_size in (1, 2, 3, 100):
+            self.assertEquals(list(iterload(type, StringIO(data), chunk_size)),
+                              [123, 4, 56789])
+        self.assertEquals(list(iterload(type, StringIO('[]'))), [])
+        type = schemaish.Sequence(schemaish.String())
+        data = u'["\xa3", "a,]"]'.encode('utf-8')
+        self.assertEquals(list(iterload(type, StringIO(data), 1)),
+                          [u'\xa3', u'a,]'])
+
+    def test_iterload_structures(self):
+        type = schemaish.Sequence(Event())
+        value = {'title': u'x', 'pair': (1, u'a'), 'day': date(2009, 5, 1)}
+        data = dumps(type, [value, value])
+        items = list(iterload(type, StringIO(data), 16))
+        self.assertEquals(len(items), 2)
+        self.assertEquals(items[1]['pair'], (1, u'a'))
+        self.assertEquals(items[1]['day'], date(2009, 5, 1))
+
+    def test_iterload_errors(self):
+        type = schemaish.Sequence(schemaish.Integer())
+        for data in ['{}', '[1, 2', '[1 2]', '[1,]', '']:
+            self.assertRaises(ValueError, list, iterload(type, StringIO(data)))
+
+    def test_iterload_malformed_fails_early(self):
+        reads = []
+        class Reader(object):
+            def __init__(self, data):
+                self.f = StringIO(data)
+            def read(self, size):
+                reads.append(size)
+                return self.f.read(size)
+        for data in ['[1, x, ' + '2, ' * 10000 + '3]',
+                     '[[1, x], ' + '[2], ' * 10000 + '[3]]']:
+            del reads[:]
+            self.assertRaises(ValueError, list,
+                              iterload(schemaish.Sequence(schemaish.Sequence(
+                                  schemaish.Integer())), Reader(data), 10))
+            self.assertTrue(len(reads) < 5)
+
+    def test_iterload_split_items(self):
+        type = schemaish.Sequence(schemaish.Sequence(schemaish.Float()))
+        data = '[[1.5, -2e3], [true], [null, "a\\"b"], [{"x": "]"}]]'
+        for chunk_size in (1, 2, 3, 100):
+            self.assertEquals(list(iterload(schemaish.Sequence(
+                schemaish.Float()), StringIO('[1.5, -2e3, 12]'), chunk_size)),
+                [1.5, -2000.0, 12])
+            self.assertEquals(len(list(iterload(type, StringIO(data),
+                                                chunk_size))), 4)
+
+    def test_iterload_nested(self):
+        for type, value in [
+                (schemaish.Sequence(schemaish.Sequence(schemaish.Date())),
+                 [[date(2009, 5, 1)], [], None]),
+                (schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                                     schemaish.Date()))),
+                 [(1, date(2009, 5, 1)), None]),
+                (schemaish.Sequence(schemaish.Sequence(schemaish.Integer())),
+                 [[1, 2], [3]])]:
+            data = dumps(type, value)
+            self.assertEquals(list(iterload(type, StringIO(data), 5)), value)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import threading
+import unittest
+from datetime import date
+from decimal import Decimal
+import schemaish
+
+from convertish.convert import string_converter, json_converter, \
+        binary_converter, ConverterFamily, ConvertError, DateToStringConverter
+from convertish.memo import memoize, MemoConverter
+
+
+class TestMemoConverter(unittest.TestCase):
+
+    def test_memoizes(self):
+        converter = MemoConverter(string_converter(schemaish.Date()))
+        first = converter.to_type('2009-05-01')
+        self.assertEquals(first, date(2009, 5, 1))
+        self.assertTrue(converter.to_type(' 2009-05-01 '.strip()) is first)
+        self.assertEquals(converter.to_type_many(['2009-05-01', None]),
+                          [first, None])
+        info = converter.cache_info()
+        self.assertEquals((info['hits'], info['misses'], info['currsize']),
+                          (2, 1, 1))
+        self.assertEquals(info['hit_rate'], 2 / 3.0)
+        self.assertEquals(converter.from_type(first), '2009-05-01')
+        converter.cache_clear()
+        self.assertEquals(converter.cache_info()['currsize'], 0)
+
+    def test_lru_eviction(self):
+        converter = MemoConverter(string_converter(schemaish.Integer()),
+                                  maxsize=4)
+        for value in ['1', '2', '3', '4', '1', '5']:
+            converter.to_type(value)
+        self.assertEquals(sorted(value for t, value in converter._cache),
+                          ['1', '3', '4', '5'])
+        converter.to_type_many(['3', '6', '7'])
+        self.assertEquals(sorted(value for t, value in converter._cache),
+                          ['3', '5', '6', '7'])
+        self.assertEquals(converter.cache_info()['currsize'], 4)
+
+    def test_errors_not_memoized(self):
+        converter = MemoConverter(string_converter(schemaish.Integer()))
+        self.assertRaises(ConvertError, converter.to_type, 'x')
+        self.assertEquals(converter.cache_info()['currsize'], 0)
+        try:
+            converter.to_type_many(['1', 'x'])
+        except ConvertError, e:
+            self.assertEquals(e.index, 1)
+
+    def test_unhashable_and_options(self):
+        converter = MemoConverter(json_converter(schemaish.Date()))
+        value = {'__type__': 'date', 'year': 2009, 'month': 5, 'day': 1}
+        self.assertEquals(converter.to_type(value), date(2009, 5, 1))
+        converter = MemoConverter(string_converter(schemaish.Decimal()))
+        self.assertEquals(converter.to_type('1.234', {'quantize': -2}),
+                          Decimal('1.23'))
+        self.assertEquals(converter.cache_info()['currsize'], 0)
+
+    def test_mixed_types(self):
+        converter = MemoConverter(json_converter(schemaish.Decimal()))
+        self.assertEquals(converter.to_type(1), Decimal('1'))
+        self.assertEquals(str(converter.to_type(1.0)), '1.0')
+        self.assertEquals(str(converter.to_type_many([1.0, 1])[0]), '1.0')
+        converter = MemoConverter(json_converter(schemaish.Integer()))
+        self.assertTrue(converter.to_type(True) is True)
+        self.assertTrue(type(converter.to_type(1)) is int)
+        self.assertEquals([type(v) for v in
+                           converter.to_type_many([1, True, 1.0])],
+                          [int, bool, float])
+        self.assertEquals(converter.cache_info()['currsize'], 3)
+
+    def test_immutable_only(self):
+        schema = schemaish.Sequence(schemaish.Integer())
+        self.assertRaises(TypeError, MemoConverter, string_converter(schema))
+        self.assertRaises(TypeError, MemoConverter,
+                          string_converter(schemaish.File()))
+        self.assertRaises(TypeError, MemoConverter,
+                          binary_converter(schemaish.File()))
+        for schema in [schemaish.String(), schemaish.Boolean(),
+                       schemaish.Date()]:
+            for family in (string_converter, json_converter,
+                           binary_converter):
+                MemoConverter(family(schema))
+
+    def test_threads(self):
+        converter = MemoConverter(string_converter(schemaish.Integer()),
+                                  maxsize=50)
+        values = [str(n % 100) for n in range(2000)]
+        results = []
+        def convert():
+            results.append(converter.to_type_many(values))
+        threads = [threading.Thread(target=convert) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = [n % 100 for n in range(2000)]
+        self.assertEquals(results, [expected] * 4)
+        self.assertTrue(converter.cache_info()['currsize'] <= 50)
+
+
+class TestMemoize(unittest.TestCase):
+
+    def test_memoize_family(self):
+        @ConverterFamily
+        def test_converter(schema_type):
+            pass
+        test_converter.when_type(schemaish.Date)(DateToStringConverter)
+        memoize('test', schemaish.Date, maxsize=10)
+        converter = test_converter(schemaish.Date())
+        self.assertTrue(isinstance(converter, MemoConverter))
+        self.assertTrue(converter is test_converter(schemaish.Date()))
+        self.assertEquals(converter.maxsize, 10)
+        self.assertEquals(converter.to_type('2009-05-01'), date(2009, 5, 1))
+        self.assertRaises(ValueError, memoize, 'nonesuch', schemaish.Date)
+
+    def test_memoize_immutable_only(self):
+        @ConverterFamily
+        def test_converter(schema_type):
+            pass
+        for schema_class in (schemaish.File, schemaish.Sequence,
+                             schemaish.Tuple, schemaish.Structure):
+            self.assertRaises(TypeError, memoize, test_converter, schema_class)
+        self.assertFalse(test_converter.has_type(schemaish.File))
+
+
+if __name__ == '__main__':
+    unittest.main()
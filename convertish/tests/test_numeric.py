@@ -0,0 +1,137 @@
+import array
+import unittest
+import schemaish
+
+from convertish import convert
+from convertish.convert import string_converter, ConvertError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+NUMPY = {'output': 'numpy'}
+ARRAY = {'output': 'array'}
+
+
+class TestNumericSequences(unittest.TestCase):
+
+    def test_empty(self):
+        converter = string_converter(schemaish.Sequence(schemaish.Integer()))
+        self.assertEquals(converter.to_type(''), [])
+        self.assertEquals(converter.to_type(converter.from_type([])), [])
+
+    def test_numpy_missing(self):
+        converter = string_converter(schemaish.Sequence(schemaish.Integer()))
+        haveNumpy, convert.haveNumpy = convert.haveNumpy, False
+        try:
+            self.assertEquals(converter.to_type('1,2', NUMPY), [1, 2])
+        finally:
+            convert.haveNumpy = haveNumpy
+
+    def test_array(self):
+        converter = string_converter(schemaish.Sequence(schemaish.Integer()))
+        result = converter.to_type(u'1, -2,"3"', ARRAY)
+        self.assertEquals(result, array.array('l', [1, -2, 3]))
+        self.assertEquals(converter.from_type(result), '1,-2,3')
+        self.assertEquals(converter.from_type(result, {'delimiter': ';'}),
+                          '1;-2;3')
+        self.assertEquals(converter.to_type('', ARRAY), array.array('l'))
+        self.assertEquals(converter.to_type('1,%d' % 2**70, ARRAY),
+                          [1, 2**70])
+        converter = string_converter(schemaish.Sequence(schemaish.Float()))
+        result = converter.to_type('1.5,2,1e3', ARRAY)
+        self.assertEquals(result, array.array('d', [1.5, 2.0, 1000.0]))
+        values = [1.5, 1/3.0, -2e20]
+        self.assertEquals(converter.from_type(array.array('d', values)),
+                          converter.from_type(values))
+        for values in ([], [1.5]):
+            self.assertTrue(isinstance(
+                converter.from_type(array.array('d', values)), unicode))
+        converter = string_converter(schemaish.Sequence(schemaish.String()))
+        self.assertEquals(converter.to_type('a,b', ARRAY), [u'a', u'b'])
+
+    def test_array_error_index(self):
+        converter = string_converter(schemaish.Sequence(schemaish.Integer()))
+        value = ','.join(['1'] * 5000 + ['x'])
+        try:
+            converter.to_type(value, ARRAY)
+        except ConvertError, e:
+            self.assertEquals(e.index, 5000)
+        else:
+            self.fail('ConvertError not raised')
+
+    if numpy is not None:
+
+        def test_numpy_integers(self):
+            converter = string_converter(
+                schemaish.Sequence(schemaish.Integer()))
+            for value, expected in [('1,2,3', [1, 2, 3]),
+                                    (u'1, -2,+3', [1, -2, 3]),
+                                    ('"1",2', [1, 2]),
+                                    ('', [])]:
+                result = converter.to_type(value, NUMPY)
+                self.assertTrue(isinstance(result, numpy.ndarray))
+                self.assertEquals(result.dtype, numpy.int64)
+                self.assertEquals(result.tolist(), expected)
+            result = converter.to_type('1;2', {'output': 'numpy',
+                                               'delimiter': ';'})
+            self.assertEquals(result.tolist(), [1, 2])
+            result = converter.to_type('1,%d' % 2**70, NUMPY)
+            self.assertEquals(result.tolist(), [1, 2**70])
+
+        def test_numpy_errors(self):
+            converter = string_converter(
+                schemaish.Sequence(schemaish.Integer()))
+            for value, index in [('1,,3', 1), ('1,2,x', 2), ('1,2,1.5', 2),
+                                 ('1 2,3,4x', 0)]:
+                try:
+                    converter.to_type(value, NUMPY)
+                except ConvertError, e:
+                    self.assertEquals((value, e.index), (value, index))
+                else:
+                    self.fail('ConvertError not raised for %r' % value)
+
+        def test_numpy_floats(self):
+            converter = string_converter(schemaish.Sequence(schemaish.Float()))
+            result = converter.to_type('1.5,2,1e3', NUMPY)
+            self.assertEquals(result.dtype, numpy.float64)
+            self.assertEquals(result.tolist(), [1.5, 2.0, 1000.0])
+
+        def test_numpy_not_numeric(self):
+            for schema in [schemaish.Sequence(schemaish.String()),
+                           schemaish.Sequence(schemaish.Sequence(
+                               schemaish.Integer()))]:
+                converter = string_converter(schema)
+                self.assertTrue(isinstance(converter.to_type('1,2', NUMPY),
+                                           list))
+
+        def test_format_ndarray(self):
+            converter = string_converter(schemaish.Sequence(schemaish.Float()))
+            values = [1.5, 1/3.0, -2e20]
+            self.assertEquals(converter.from_type(numpy.array(values)),
+                              converter.from_type(values))
+            converter = string_converter(
+                schemaish.Sequence(schemaish.Integer()))
+            self.assertEquals(converter.from_type(numpy.arange(3)), '0,1,2')
+            self.assertEquals(converter.from_type(numpy.arange(3),
+                                                  {'delimiter': ';'}),
+                              '0;1;2')
+            self.assertEquals(converter.from_type(numpy.array([], 'int64')),
+                              '')
+            for values in ([], [1, 2]):
+                self.assertTrue(isinstance(
+                    converter.from_type(numpy.array(values, 'int64')),
+                    unicode))
+
+        def test_format_ndarray_other_dtypes(self):
+            converter = string_converter(schemaish.Sequence(schemaish.Float()))
+            for dtype in ('float32', 'float16', 'int32', 'uint8'):
+                values = numpy.array([0.1, 3, 7.5], dtype)
+                self.assertEquals(converter.from_type(values),
+                                  converter.from_type(list(values)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import multiprocessing
+from multiprocessing.pool import ThreadPool
+import unittest
+import schemaish
+
+from convertish.convert import string_converter, ConvertError
+from convertish.parallel import parallel_to_type, iconvert
+
+
+class TestParallelToType(unittest.TestCase):
+
+    def test_in_process(self):
+        converter = string_converter(schemaish.Integer())
+        self.assertEquals(parallel_to_type(converter, ['1', '2', None]),
+                          [1, 2, None])
+        self.assertEquals(parallel_to_type(converter, None), None)
+
+    def test_pool_keeps_order(self):
+        converter = string_converter(schemaish.Integer())
+        values = [str(n) for n in range(1000)]
+        self.assertEquals(parallel_to_type(converter, values, workers=2,
+                                           chunksize=7, threshold=0),
+                          range(1000))
+
+    def test_sequence_string(self):
+        schema = schemaish.Sequence(schemaish.Tuple((schemaish.Integer(),
+                                                     schemaish.String())))
+        converter = string_converter(schema)
+        value = '\n'.join(['%d,"row\n%d"' % (n, n) for n in range(100)])
+        pool = multiprocessing.Pool(2)
+        try:
+            result = parallel_to_type(converter, value, chunksize=9,
+                                      threshold=0, pool=pool)
+        finally:
+            pool.terminate()
+        self.assertEquals(result, converter.to_type(value))
+        self.assertEquals(result[99], (99, u'row\n99'))
+
+    def test_global_error_index(self):
+        converter = string_converter(schemaish.Sequence(schemaish.Integer()))
+        value = ','.join(['1'] * 50 + ['x'] + ['1'] * 49)
+        for threshold in (0, 1000):
+            try:
+                parallel_to_type(converter, value, workers=2, chunksize=10,
+                                 threshold=threshold)
+            except ConvertError, e:
+                self.assertEquals(e.index, 50)
+                self.assertEquals(e.message, 'Not a valid integer')
+            else:
+                self.fail('ConvertError not raised')
+
+
+class TestIConvert(unittest.TestCase):
+
+    def test_in_process(self):
+        converter = string_converter(schemaish.Integer())
+        values = (str(n) for n in xrange(25))
+        self.assertEquals(list(iconvert(converter, values, batch_size=10)),
+                          range(25))
+        self.assertEquals(list(iconvert(converter, range(3), batch_size=2,
+                                        direction='from_type')),
+                          ['0', '1', '2'])
+
+    def test_pool_back_pressure(self):
+        read = []
+        def values():
+            for n in xrange(100):
+                read.append(n)
+                yield str(n)
+        converter = string_converter(schemaish.Integer())
+        pool = ThreadPool(2)
+        try:
+            converted = iconvert(converter, values(), batch_size=10,
+                                 pool=pool, max_pending=2)
+            self.assertEquals(converted.next(), 0)
+            # The first batch and two more pending.
+            self.assertEquals(len(read), 30)
+            self.assertEquals(list(converted), range(1, 100))
+        finally:
+            pool.terminate()
+
+    def test_error_index(self):
+        converter = string_converter(schemaish.Integer())
+        values = ['1'] * 25 + ['x']
+        pool = ThreadPool(2)
+        try:
+            for p in (None, pool):
+                try:
+                    list(iconvert(converter, values, batch_size=10, pool=p))
+                except ConvertError, e:
+                    self.assertEquals(e.index, 25)
+                else:
+                    self.fail('ConvertError not raised')
+        finally:
+            pool.terminate()
+
+
+if __name__ == '__main__':
+    unittest.main()
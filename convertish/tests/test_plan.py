@@ -0,0 +1,72 @@
+import pickle
+import unittest
+import schemaish
+from datetime import date
+
+from convertish.convert import ConvertError
+from convertish.plan import compile_plan
+
+
+class Address(schemaish.Structure):
+    street = schemaish.String()
+    moved = schemaish.Date()
+
+
+class Person(schemaish.Structure):
+    name = schemaish.String()
+    age = schemaish.Integer()
+    address = Address()
+    scores = schemaish.Sequence(schemaish.Integer())
+
+
+class TestPlan(unittest.TestCase):
+
+    def test_string_to_type(self):
+        plan = compile_plan(Person())
+        actual = plan({'name': u'Tim', 'age': '42', 'scores': '1,2',
+                       'address': {'street': u'High St',
+                                   'moved': '2009-01-05'}})
+        expected = {'name': u'Tim', 'age': 42, 'scores': [1, 2],
+                    'address': {'street': u'High St',
+                                'moved': date(2009, 1, 5)}}
+        self.assertEquals(actual, expected)
+
+    def test_string_from_type(self):
+        plan = compile_plan(Person(), direction='from_type')
+        actual = plan({'name': u'Tim', 'age': 42, 'scores': [1, 2],
+                       'address': {'street': u'High St',
+                                   'moved': date(2009, 1, 5)}})
+        expected = {'name': u'Tim', 'age': '42', 'scores': '1,2',
+                    'address': {'street': u'High St',
+                                'moved': '2009-01-05'}}
+        self.assertEquals(actual, expected)
+
+    def test_missing_values(self):
+        plan = compile_plan(Person())
+        self.assertEquals(plan({'address': None}),
+                          {'name': None, 'age': None, 'scores': None,
+                           'address': None})
+
+    def test_json(self):
+        schema = schemaish.Structure([
+            ('people', schemaish.Sequence(Address())),
+        ])
+        plan = compile_plan(schema, family='json')
+        actual = plan({'people': [{'street': u'a', 'moved':
+                                   {'year': 2009, 'month': 1, 'day': 5}}]})
+        self.assertEquals(actual, {'people': [{'street': u'a',
+                                               'moved': date(2009, 1, 5)}]})
+
+    def test_errors(self):
+        plan = compile_plan(Person())
+        self.assertRaises(ConvertError, plan, {'age': 'x'})
+        self.assertRaises(ValueError, compile_plan, Person(), family='nope')
+        self.assertRaises(ValueError, compile_plan, Person(), direction='x')
+
+    def test_pickle(self):
+        plan = pickle.loads(pickle.dumps(compile_plan(Person())))
+        self.assertEquals(plan({'age': '1'})['age'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from datetime import date, datetime, time
+from decimal import Decimal
+import schemaish
+
+from convertish.convert import ConvertError
+from convertish.records import RecordConverter
+from convertish.util import SimpleTZInfo
+
+
+SCHEMA = schemaish.Tuple((schemaish.Integer(), schemaish.Float(),
+                          schemaish.Boolean(), schemaish.Date(),
+                          schemaish.Time(), schemaish.DateTime()))
+ROWS = [(1, 0.5, True, date(2009, 5, 1), time(12, 30, 15, 250000),
+         datetime(2009, 5, 1, 12, 30, 15, 1)),
+        (-2**63, -1e300, False, date(1, 1, 1), time(0, 0),
+         datetime(9999, 12, 31, 23, 59, 59, 999999)),
+        (None, None, None, None, None, None),
+        (3, None, False, None, time(23, 59, 59, 999999), None)]
+
+
+class TestRecordConverter(unittest.TestCase):
+
+    def test_round_trip(self):
+        converter = RecordConverter(SCHEMA)
+        self.assertEquals(converter.size, 1 + 8 + 8 + 1 + 4 + 8 + 8)
+        for row in ROWS:
+            record = converter.from_type(row)
+            self.assertEquals(len(record), converter.size)
+            self.assertEquals(converter.to_type(record), row)
+            self.assertEquals(converter.to_type(bytearray(record)), row)
+        self.assertEquals(converter.from_type(None), None)
+        self.assertEquals(converter.to_type(None), None)
+
+    def test_many(self):
+        converter = RecordConverter(SCHEMA)
+        buf = converter.pack_many(iter(ROWS))
+        self.assertTrue(isinstance(buf, bytearray))
+        self.assertEquals(len(buf), len(ROWS) * converter.size)
+        for data in (buf, str(buf), memoryview(buf), buffer(buf)):
+            self.assertEquals(converter.unpack_many(data), ROWS)
+            self.assertEquals(list(converter.iter_unpack(data)), ROWS)
+            self.assertEquals(list(converter.iter_column(data, 3)),
+                              [row[3] for row in ROWS])
+            self.assertEquals(converter.unpack_from(data, 3), ROWS[3])
+        self.assertEquals(converter.unpack_many(''), [])
+        self.assertRaises(IndexError, converter.unpack_from, buf, 4)
+        self.assertRaises(IndexError, converter.iter_column, buf, 6)
+
+    def test_pack_into(self):
+        converter = RecordConverter(schemaish.Tuple((schemaish.Integer(),
+                                                     schemaish.Integer())))
+        buf = bytearray(3 * converter.size)
+        view = memoryview(buf)
+        converter.pack_into(view, 1, (1, 2))
+        self.assertEquals(converter.unpack_many(buf),
+                          [(0, 0), (1, 2), (0, 0)])
+
+    def test_invalid(self):
+        converter = RecordConverter(SCHEMA)
+        record = converter.from_type(ROWS[0])
+        self.assertRaises(ConvertError, converter.to_type, record[:-1])
+        self.assertRaises(ConvertError, converter.unpack_many, record + 'x')
+        self.assertRaises(ValueError, converter.from_type, ROWS[0][:-1])
+        self.assertRaises(ValueError, converter.from_type,
+                          ROWS[0][:4] + (time(1, 0, 0, 0, SimpleTZInfo(60)),
+                                         None))
+        big = (2**70,) + ROWS[0][1:]
+        self.assertRaises(ValueError, converter.from_type, big)
+        self.assertRaises(ValueError, converter.pack_many, [ROWS[0], big])
+        self.assertRaises(ValueError, converter.pack_into,
+                          bytearray(converter.size), 0, big)
+        self.assertRaises(IndexError, converter.pack_into,
+                          bytearray(converter.size), 1, ROWS[0])
+        for item in (1.7, '12', Decimal('1')):
+            row = (item,) + ROWS[0][1:]
+            self.assertRaises(ValueError, converter.from_type, row)
+            self.assertRaises(ValueError, converter.pack_many, [row])
+        date_converter = RecordConverter(schemaish.Tuple((schemaish.Date(),)))
+        self.assertRaises(ConvertError, date_converter.to_type, '\x00' * 5)
+
+    def test_unsupported(self):
+        self.assertRaises(TypeError, RecordConverter,
+                          schemaish.Tuple((schemaish.String(),)))
+        self.assertRaises(TypeError, RecordConverter,
+                          schemaish.Tuple((schemaish.Integer(),) * 65))
+        converter = RecordConverter(schemaish.Tuple((schemaish.Boolean(),) *
+                                                    64))
+        row = (True, None) * 32
+        self.assertEquals(converter.to_type(converter.from_type(row)), row)
+
+
+if __name__ == '__main__':
+    unittest.main()
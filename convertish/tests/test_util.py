@@ -1,7 +1,9 @@
-from datetime import time, timedelta
+import copy
+import pickle
+from datetime import datetime, time, timedelta
 import unittest
 
-from convertish.util import SimpleTZInfo
+from convertish.util import SimpleTZInfo, LazyModule
 
 
 class TestSimpleTZInfo(unittest.TestCase):
@@ -26,3 +28,30 @@ class TestSimpleTZInfo(unittest.TestCase):
         self.assertEquals(time(1, 2, 3, 0, SimpleTZInfo(90)).isoformat(), '01:02:03+01:30')
         self.assertEquals(time(1, 2, 3, 0, SimpleTZInfo(-90)).isoformat(), '01:02:03-01:30')
 
+    def test_interned(self):
+        self.assertTrue(SimpleTZInfo(90) is SimpleTZInfo(90))
+        self.assertTrue(SimpleTZInfo(90) is not SimpleTZInfo(-90))
+        self.assertTrue(copy.deepcopy(SimpleTZInfo(90)) is SimpleTZInfo(90))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            tz = pickle.loads(pickle.dumps(SimpleTZInfo(90), protocol))
+            self.assertTrue(tz is SimpleTZInfo(90))
+        dt = datetime(2001, 2, 3, tzinfo=SimpleTZInfo(60))
+        self.assertTrue(pickle.loads(pickle.dumps(dt, 2)).tzinfo is
+                        SimpleTZInfo(60))
+
+    def test_immutable(self):
+        tz = SimpleTZInfo(30)
+        self.assertRaises(AttributeError, setattr, tz, 'minutes', 60)
+        self.assertRaises(AttributeError, setattr, tz, 'other', 60)
+        self.assertEquals(tz.minutes, 30)
+
+
+class TestLazyModule(unittest.TestCase):
+
+    def test_imports_on_first_use(self):
+        module = LazyModule('colorsys')
+        self.assertFalse('rgb_to_hsv' in module.__dict__)
+        import colorsys
+        self.assertTrue(module.rgb_to_hsv is colorsys.rgb_to_hsv)
+        self.assertTrue(module.__dict__['rgb_to_hsv'] is colorsys.rgb_to_hsv)
+        self.assertRaises(AttributeError, getattr, module, 'nonesuch')
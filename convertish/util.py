@@ -2,6 +2,7 @@
 General support and utility module.
 """
 
+import sys
 from datetime import timedelta, tzinfo
 
 
@@ -9,22 +10,78 @@ class SimpleTZInfo(tzinfo):
     """
     Simple concrete datetime.tzinfo class that handles only
     offset in minutes form UTC.
+
+    Instances are immutable and interned: there is only ever one instance per
+    offset, so equal offsets are identical objects. This keeps memory down
+    when many values share an offset and lets datetime comparisons skip the
+    utcoffset() calls altogether.
     """
 
-    def __init__(self, minutes):
-        self.minutes = minutes
+    __slots__ = ('minutes', '_utcoffset', '_tzname')
+
+    _instances = {}
+
+    def __new__(cls, minutes):
+        try:
+            return cls._instances[minutes]
+        except KeyError:
+            pass
+        self = tzinfo.__new__(cls)
+        init = object.__setattr__
+        init(self, 'minutes', minutes)
+        init(self, '_utcoffset', timedelta(minutes=minutes))
+        if minutes < 0:
+            sign = '-'
+            hours, mins = divmod(-minutes, 60)
+        else:
+            sign = '+'
+            hours, mins = divmod(minutes, 60)
+        init(self, '_tzname', '%s%02d:%02d' % (sign, hours, mins))
+        return cls._instances.setdefault(minutes, self)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('SimpleTZInfo instances are immutable')
+
+    def __reduce__(self):
+        return (SimpleTZInfo, (self.minutes,))
+
+    def __repr__(self):
+        return 'SimpleTZInfo(%d)' % self.minutes
 
     def utcoffset(self, dt):
-        return timedelta(minutes=self.minutes)
+        return self._utcoffset
 
     def dst(self, dt):
-        return timedelta()
+        return _ZERO
 
     def tzname(self, dt):
-        if self.minutes < 0:
-            sign = '-'
-            hours, minutes = divmod(-self.minutes, 60)
-        else:
-            sign = '+'
-            hours, minutes = divmod(self.minutes, 60)
-        return '%s%02d:%02d' % (sign, hours, minutes)
+        return self._tzname
+
+
+_ZERO = timedelta()
+
+
+class LazyModule(object):
+    """
+    Stand-in for a module that is only imported when one of its attributes
+    is first used, for modules that are expensive to import and only needed
+    by some converters, e.g.
+
+        csv = LazyModule('csv')
+
+    Once imported, the module's attributes are copied onto the stand-in so
+    later lookups cost the same as on the module itself.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_LazyModule__name'] = name
+
+    def __getattr__(self, attr):
+        name = self.__name
+        __import__(name)
+        module = sys.modules[name]
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self):
+        return '<LazyModule %r>' % self.__name
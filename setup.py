@@ -30,7 +30,6 @@ Convertish uses adaption to coerce variable types. It currently has converters r
       install_requires=[
           # -*- Extra requirements: -*-
           "schemaish",
-          "simplegeneric",
           "validatish",
       ],
       entry_points="""